@@ -0,0 +1,286 @@
+"""Mode multi-arènes : le monde est découpé en tuiles, chacune avec ses cercles
+concentriques et plusieurs balles, qui rebondissent aussi les unes sur les autres.
+
+Les collisions entre balles passent par une grille de hachage uniforme
+reconstruite à chaque pas : seules les balles de cellules voisines sont
+comparées, au lieu de toutes les paires.
+"""
+import math
+
+from moteur import (
+    LARGEUR, HAUTEUR, Balle, Cercle, IndexRadial, Instantane, PoolEffets, Simulation,
+    couleurs, creer_nouveau_cercle_exterieur, rebondir_sur_bords,
+)
+
+# Cellules voisines à comparer : la moitié du voisinage suffit (chaque paire une seule fois)
+VOISINS = ((1, -1), (1, 0), (1, 1), (0, 1))
+
+
+# Hachage spatial des balles
+class GrilleSpatiale:
+    """Balles rangées par cellule carrée ; une cellule au moins aussi large qu'un diamètre"""
+
+    def __init__(self, taille_cellule):
+        self.taille_cellule = taille_cellule
+        self.cellules = {}
+
+    def reconstruire(self, balles):
+        cellules = self.cellules
+        cellules.clear()
+        taille = self.taille_cellule
+        for balle in balles:
+            cle = (int(balle.x // taille), int(balle.y // taille))
+            occupants = cellules.get(cle)
+            if occupants is None:
+                cellules[cle] = [balle]
+            else:
+                occupants.append(balle)
+
+    def paires(self):
+        """Paires de balles assez proches pour se toucher (même cellule ou cellules voisines)"""
+        cellules = self.cellules
+        for (cx, cy), occupants in cellules.items():
+            for i, balle in enumerate(occupants):
+                for autre in occupants[i + 1:]:
+                    yield balle, autre
+            for dx, dy in VOISINS:
+                voisins = cellules.get((cx + dx, cy + dy))
+                if voisins:
+                    for balle in occupants:
+                        for autre in voisins:
+                            yield balle, autre
+
+
+def rebondir_balles(balle, autre):
+    """Choc élastique entre deux balles de même masse ; renvoie True s'il y a eu contact"""
+    dx = autre.x - balle.x
+    dy = autre.y - balle.y
+    distance = math.sqrt(dx * dx + dy * dy)
+    contact = balle.rayon + autre.rayon
+    if distance >= contact or distance == 0:
+        return False
+
+    # Normale de contact
+    nx = dx / distance
+    ny = dy / distance
+
+    # Vitesse relative le long de la normale : réflexion uniquement si les balles se rapprochent
+    dot = (balle.vitesse_x - autre.vitesse_x) * nx + (balle.vitesse_y - autre.vitesse_y) * ny
+    if dot > 0:
+        # Masses égales : les composantes normales s'échangent
+        balle.vitesse_x -= dot * nx
+        balle.vitesse_y -= dot * ny
+        autre.vitesse_x += dot * nx
+        autre.vitesse_y += dot * ny
+
+    # Séparer les balles pour qu'elles ne restent pas collées
+    recouvrement = (contact - distance) / 2
+    balle.x -= nx * recouvrement
+    balle.y -= ny * recouvrement
+    autre.x += nx * recouvrement
+    autre.y += ny * recouvrement
+    return True
+
+
+# Une tuile du monde
+class Arene:
+    """Cercles concentriques d'une tuile et balles qui y restent confinées"""
+
+    def __init__(self, x, y, largeur, hauteur):
+        self.x = x
+        self.y = y
+        self.largeur = largeur
+        self.hauteur = hauteur
+        self.centre_x = x + largeur // 2
+        self.centre_y = y + hauteur // 2
+        # Les cercles du jeu sont prévus pour un écran de HAUTEUR pixels
+        self.echelle = min(largeur, hauteur) / HAUTEUR
+        self.rayon_balle = max(3, round(8 * self.echelle))
+        self.balles = []
+        self.cercles = []
+        self.index = IndexRadial()
+        # Cercles dont chaque balle occupe l'ouverture, par id(balle)
+        self.suivis = {}
+
+    def configurer_cercle(self, cercle, physique):
+        cercle.angle_ouverture = physique['angle_ouverture']
+        cercle.vitesse_reduction = physique['vitesse_reduction'] * self.echelle
+        cercle.rayon_min = cercle.rayon_min * self.echelle
+        cercle.epaisseur = max(2, round(cercle.epaisseur * self.echelle))
+        return cercle
+
+    def reinitialiser_cercles(self, physique, rng):
+        self.cercles.clear()
+        vitesse_rotation = physique['vitesse_commune']
+        for i, rayon in enumerate(physique['rayons']):
+            couleur = couleurs[i % len(couleurs)]
+            # Alternance du sens de rotation
+            vitesse = vitesse_rotation if i % 2 == 0 else -vitesse_rotation
+            self.cercles.append(self.configurer_cercle(
+                Cercle(self.centre_x, self.centre_y, rayon * self.echelle, couleur, vitesse, rng), physique))
+        self.index = IndexRadial(self.cercles)
+        self.suivis.clear()
+
+    def reinitialiser_balles(self, n, rng):
+        # Balles dispersées autour du centre, dans le plus petit cercle
+        if len(self.balles) != n:
+            self.balles = [Balle(self.centre_x, self.centre_y, self.rayon_balle, 0, 0) for _ in range(n)]
+            for balle in self.balles:
+                balle.ajuster_trainee(10)  # Traînées courtes : beaucoup de balles à dessiner
+        portee = max(0, min((c.rayon for c in self.cercles), default=0) - self.rayon_balle)
+        for balle in self.balles:
+            balle.trainee.clear()
+            balle.x = self.centre_x + rng.uniform(-portee, portee) / 2
+            balle.y = self.centre_y + rng.uniform(-portee, portee) / 2
+            balle.vitesse_x = rng.uniform(-300, 300)
+            balle.vitesse_y = rng.uniform(-120, 120)
+        self.suivis.clear()
+
+    def avancer_cercles(self, dt):
+        for cercle in self.cercles:
+            cercle.tourner(dt)
+            cercle.reduire_taille(dt)
+        self.index.reordonner()
+
+    def resoudre_collisions(self, balle, physique, rng):
+        """Collisions d'une balle avec les cercles proches ; renvoie les cercles traversés"""
+        suivis = self.suivis.get(id(balle), ())
+        distance = math.sqrt((balle.x - self.centre_x)**2 + (balle.y - self.centre_y)**2)
+        marge = balle.rayon + 2
+        candidats = self.index.entre(distance - marge, distance + marge)
+        for cercle in suivis:
+            if cercle.actif and cercle not in candidats:
+                candidats.append(cercle)
+
+        disparus = []
+        for cercle in candidats:
+            if not cercle.actif:
+                continue
+            # L'état d'ouverture est propre à chaque couple (balle, cercle)
+            cercle.dans_ouverture = cercle in suivis
+            if cercle.verifier_collision(balle):
+                cercle.faire_rebondir(balle)
+            elif cercle.vient_de_disparaitre:
+                cercle.vient_de_disparaitre = False
+                disparus.append(cercle)
+        self.suivis[id(balle)] = [c for c in candidats if c.actif and c.dans_ouverture]
+
+        # Remplacer les cercles traversés par de nouveaux, à l'échelle de l'arène
+        for cercle in disparus:
+            self.index.retirer(cercle)
+            vitesse = physique['vitesse_commune']
+            nouveau = self.configurer_cercle(creer_nouveau_cercle_exterieur(
+                self.centre_x, self.centre_y, self.index, rng, vitesse, self.echelle), physique)
+            self.cercles[self.cercles.index(cercle)] = nouveau
+            self.index.ajouter(nouveau)
+        return disparus
+
+    def rebondir_murs(self, balle):
+        rebondir_sur_bords(balle, self.x, self.y, self.x + self.largeur, self.y + self.hauteur)
+
+
+# Simulation de plusieurs arènes et de nombreuses balles
+class SimulationArenes(Simulation):
+    """Arènes indépendantes en grille (colonnes x rangées), plusieurs balles par arène"""
+
+    def __init__(self, colonnes=4, rangees=2, balles_par_arene=8, largeur=LARGEUR, hauteur=HAUTEUR,
+                 dt_fixe=None, parametres=None, graine=None):
+        self.balles_par_arene = balles_par_arene
+        largeur_arene = largeur // colonnes
+        hauteur_arene = hauteur // rangees
+        self.arenes = [Arene(c * largeur_arene, r * hauteur_arene, largeur_arene, hauteur_arene)
+                       for r in range(rangees) for c in range(colonnes)]
+        self.balles = []
+        # Deux balles qui se touchent sont dans la même cellule ou dans des cellules voisines
+        self.grille = GrilleSpatiale(2 * max(arene.rayon_balle for arene in self.arenes))
+        self.collisions_balles = 0
+        super().__init__(largeur, hauteur, dt_fixe, parametres, graine=graine)
+        self.effets = PoolEffets(max_effets=64)
+
+    def reinitialiser_cercles(self):
+        for arene in self.arenes:
+            arene.reinitialiser_cercles(self.physique, self.rng)
+        self.cercles = [cercle for arene in self.arenes for cercle in arene.cercles]
+        self.effets.clear()
+        if not self.balles:
+            self.reinitialiser_balle()
+
+    def reinitialiser_balle(self):
+        if not self.arenes[0].cercles:
+            return  # Appel du constructeur avant les cercles : les balles viendront après eux
+        for arene in self.arenes:
+            arene.reinitialiser_balles(self.balles_par_arene, self.rng)
+        self.balles = [balle for arene in self.arenes for balle in arene.balles]
+        self.balle = self.balles[0]
+
+    def allonger_trainee(self):
+        for balle in self.balles:
+            balle.ajuster_trainee(balle.max_trainee + 10)
+
+    def raccourcir_trainee(self):
+        for balle in self.balles:
+            balle.ajuster_trainee(balle.max_trainee - 10)
+
+    def effacer_trainee(self):
+        for balle in self.balles:
+            balle.trainee.clear()
+
+    def pas(self, dt):
+        """Un pas de physique de durée dt pour toutes les arènes"""
+        profileur = self.profileur
+        physique = self.physique
+        rng = self.rng
+
+        # Mettre à jour les cercles
+        for arene in self.arenes:
+            arene.avancer_cercles(dt)
+        if profileur:
+            profileur.marquer('cercles')
+
+        # Collisions balle-cercle, puis balle-balle par la grille
+        for arene in self.arenes:
+            for balle in arene.balles:
+                for cercle in arene.resoudre_collisions(balle, physique, rng):
+                    self.effets.emettre(cercle.x, cercle.y, cercle.rayon, cercle.couleur)
+                    self.compter_echappement()
+        self.cercles = [cercle for arene in self.arenes for cercle in arene.cercles]
+        self.grille.reconstruire(self.balles)
+        for balle, autre in self.grille.paires():
+            if rebondir_balles(balle, autre):
+                self.collisions_balles += 1
+        if profileur:
+            profileur.marquer('collisions')
+
+        # Déplacer les balles, chacune confinée dans son arène
+        gravite = physique['gravite']
+        vitesse_min = physique['vitesse_min']
+        for arene in self.arenes:
+            for balle in arene.balles:
+                balle.deplacer(dt, gravite, rng, vitesse_min)
+                arene.rebondir_murs(balle)
+        if profileur:
+            profileur.marquer('deplacer')
+
+        # Mettre à jour les effets
+        self.effets.update(dt)
+        if profileur:
+            profileur.marquer('effets')
+
+        self.temps += dt
+        self.pas_effectues += 1
+
+    def energie(self):
+        """Énergie moyenne des balles"""
+        gravite = abs(self.physique['gravite'])
+        return sum((b.vitesse_x**2 + b.vitesse_y**2) / 100 + gravite * (self.hauteur - b.y) / 1000
+                   for b in self.balles) / len(self.balles)
+
+    def instantane(self):
+        """Instantané de toutes les arènes ; la première balle sert de balle de référence"""
+        return Instantane(
+            self.temps,
+            self.balle.etat(),
+            tuple(cercle.etat() for cercle in self.cercles),
+            tuple(effet.etat() for effet in self.effets),
+            tuple(balle.etat() for balle in self.balles[1:]),
+        )
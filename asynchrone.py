@@ -0,0 +1,122 @@
+"""Simulation dans son propre fil, à pas fixe, indépendante du rythme du rendu.
+
+Le fil publie après chaque pas un instantané immuable ; le rendu lit les deux
+derniers (double tampon) et interpole entre eux. Une image lente ne change donc
+ni le dt de la physique ni sa stabilité, et les blits de pygame, qui relâchent
+le GIL, se font pendant que la physique avance.
+"""
+import queue
+import threading
+import time
+
+
+def _melanger(a, b, alpha):
+    return a + (b - a) * alpha
+
+
+def _angle(a, b, alpha):
+    # Par le plus court chemin, en tenant compte du passage de 360 à 0
+    return (a + ((b - a + 180) % 360 - 180) * alpha) % 360
+
+
+def interpoler_balle(a, b, alpha, saut_max=100):
+    if abs(b.x - a.x) + abs(b.y - a.y) > saut_max:
+        return b  # Balle replacée (réinitialisation) : pas de glissement
+    return b._replace(x=_melanger(a.x, b.x, alpha), y=_melanger(a.y, b.y, alpha))
+
+
+def interpoler_cercle(a, b, alpha):
+    # Un cercle remplacé occupe la même case : ne pas mélanger deux cercles différents
+    if a.actif != b.actif or a.couleur != b.couleur or abs(b.rayon - a.rayon) > 5:
+        return b
+    return b._replace(rayon=_melanger(a.rayon, b.rayon, alpha), angle=_angle(a.angle, b.angle, alpha))
+
+
+def interpoler(precedent, courant, alpha):
+    """Instantané entre precedent (alpha = 0) et courant (alpha = 1)"""
+    if alpha >= 1:
+        return courant
+    cercles = courant.cercles
+    if len(precedent.cercles) == len(cercles):
+        cercles = tuple(interpoler_cercle(a, b, alpha) for a, b in zip(precedent.cercles, cercles))
+    balles = courant.balles
+    if len(precedent.balles) == len(balles):
+        balles = tuple(interpoler_balle(a, b, alpha) for a, b in zip(precedent.balles, balles))
+    return courant._replace(
+        temps=_melanger(precedent.temps, courant.temps, alpha),
+        balle=interpoler_balle(precedent.balle, courant.balle, alpha),
+        cercles=cercles,
+        balles=balles,
+    )
+
+
+# Fil de simulation
+class FilSimulation(threading.Thread):
+    """Fait avancer une simulation à son pas fixe, en temps réel, et publie ses instantanés
+
+    Les commandes passent par une file et sont appliquées entre deux pas, dans ce fil :
+    la simulation (et l'enregistreur éventuel) n'est jamais modifiée par un autre fil.
+    """
+
+    def __init__(self, simulation, enregistreur=None):
+        super().__init__(name='simulation', daemon=True)
+        self.simulation = simulation
+        self.enregistreur = enregistreur
+        self.commandes = queue.SimpleQueue()
+        self.arret = threading.Event()
+        self.erreur = None
+        self.verrou = threading.Lock()
+        # Double tampon : (instant de publication, instantané, énergie) précédent et courant
+        publication = (time.perf_counter(), simulation.instantane(), simulation.energie())
+        self.precedent = self.courant = publication
+
+    def commande(self, commande):
+        self.commandes.put(commande)
+
+    def run(self):
+        simulation = self.simulation
+        dt = simulation.dt_fixe
+        prochain = time.perf_counter()
+        try:
+            while not self.arret.is_set():
+                while not self.commandes.empty():
+                    commande = self.commandes.get()
+                    simulation.appliquer_commande(commande)
+                    if self.enregistreur:
+                        self.enregistreur.commande(commande)
+
+                # Un pas exactement : l'accumulateur repasse à zéro, le rejeu reste identique
+                if simulation.avancer(dt):
+                    if self.enregistreur:
+                        self.enregistreur.image(dt)
+                    self.publier()
+
+                prochain += dt
+                attente = prochain - time.perf_counter()
+                if attente > 0:
+                    self.arret.wait(attente)
+                elif attente < -simulation.dt_max:
+                    prochain = time.perf_counter()  # Trop de retard : ne pas tenter de rattraper
+        except Exception as erreur:
+            self.erreur = erreur
+
+    def publier(self):
+        publication = (time.perf_counter(), self.simulation.instantane(), self.simulation.energie())
+        with self.verrou:
+            self.precedent, self.courant = self.courant, publication
+
+    def instantane(self, maintenant=None):
+        """(instantané interpolé pour maintenant, énergie) ; le rendu a un pas de retard"""
+        with self.verrou:
+            (_, precedent, _), (instant, courant, energie) = self.precedent, self.courant
+        if maintenant is None:
+            maintenant = time.perf_counter()
+        alpha = min(1.0, max(0.0, (maintenant - instant) / self.simulation.dt_fixe))
+        return interpoler(precedent, courant, alpha), energie
+
+    def arreter(self):
+        self.arret.set()
+        if self.is_alive():
+            self.join()
+        if self.erreur:
+            raise self.erreur
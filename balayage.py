@@ -0,0 +1,144 @@
+"""Balayage de paramètres : simulations sans affichage réparties sur tous les cœurs.
+
+Exemple :
+
+    python balayage.py --gravite 200 400 600 --vitesse_commune 90 120 \\
+        --graines 4 --duree 120 --sortie resultats.csv
+"""
+import argparse
+import csv
+import itertools
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from evenements import SimulationEvenements
+from moteur import Simulation
+
+# Paramètres de moteur.physique que l'on peut faire varier
+AXES = ('gravite', 'vitesse_commune', 'rayons', 'angle_ouverture', 'vitesse_reduction', 'vitesse_min')
+
+
+def grille(**axes):
+    """Produit cartésien des valeurs : grille(gravite=[200, 400], vitesse_min=[180]) -> liste de dicts"""
+    noms = list(axes)
+    return [dict(zip(noms, valeurs)) for valeurs in itertools.product(*(axes[nom] for nom in noms))]
+
+
+def executer(parametres, graine, duree=60.0, dt=1 / 120, collision_continue=False, evenements=False):
+    """Une simulation sans affichage ; renvoie ses mesures"""
+    debut = time.perf_counter()
+    if evenements:
+        return executer_evenements(parametres, graine, duree, dt, debut)
+    simulation = Simulation(dt_fixe=dt, parametres=parametres, graine=graine,
+                            collision_continue=collision_continue)
+    balle = simulation.balle
+    n_pas = int(round(duree / dt))
+    n_echantillon = max(1, n_pas // 10)  # Premier et dernier dixième pour la dérive d'énergie
+    somme_vitesses = 0.0
+    energie_debut = energie_fin = 0.0
+    for i in range(n_pas):
+        simulation.pas(dt)
+        somme_vitesses += math.sqrt(balle.vitesse_x**2 + balle.vitesse_y**2)
+        if i < n_echantillon:
+            energie_debut += simulation.energie()
+        elif i >= n_pas - n_echantillon:
+            energie_fin += simulation.energie()
+
+    return {
+        **parametres,
+        'graine': graine,
+        'duree': simulation.temps,
+        'cercles_echappes': simulation.cercles_echappes,
+        'echappes_par_minute': simulation.cercles_echappes * 60 / simulation.temps,
+        'premier_echappement': simulation.temps_premier_echappement,
+        'vitesse_moyenne': somme_vitesses / n_pas,
+        'derive_energie': (energie_fin - energie_debut) / energie_debut if energie_debut else 0.0,
+        'temps_calcul': time.perf_counter() - debut,
+    }
+
+
+def executer_evenements(parametres, graine, duree, dt, debut):
+    # Pas sautés d'un coup : pas d'échantillon à chaque pas pour la vitesse et l'énergie
+    simulation = SimulationEvenements(dt_fixe=dt, parametres=parametres, graine=graine)
+    simulation.avancer_jusqua(duree)
+    return {
+        **parametres,
+        'graine': graine,
+        'duree': simulation.temps,
+        'cercles_echappes': simulation.cercles_echappes,
+        'echappes_par_minute': simulation.cercles_echappes * 60 / simulation.temps,
+        'premier_echappement': simulation.temps_premier_echappement,
+        'vitesse_moyenne': None,
+        'derive_energie': None,
+        'temps_calcul': time.perf_counter() - debut,
+    }
+
+
+def _executer(tache):
+    return executer(*tache)
+
+
+def balayer(configurations, graines=(0,), duree=60.0, dt=1 / 120, collision_continue=False,
+            processus=None, evenements=False):
+    """Exécute chaque configuration pour chaque graine dans un pool de processus"""
+    taches = [(parametres, graine, duree, dt, collision_continue, evenements)
+              for parametres in configurations for graine in graines]
+    processus = processus or os.cpu_count() or 1
+    if processus == 1:
+        return [_executer(tache) for tache in taches]
+    with ProcessPoolExecutor(max_workers=processus) as pool:
+        return list(pool.map(_executer, taches, chunksize=max(1, len(taches) // (4 * processus))))
+
+
+def ecrire_csv(resultats, fichier):
+    colonnes = list(resultats[0]) if resultats else []
+    ecrivain = csv.DictWriter(fichier, fieldnames=colonnes)
+    ecrivain.writeheader()
+    for ligne in resultats:
+        ecrivain.writerow({cle: ' '.join(map(str, valeur)) if isinstance(valeur, (list, tuple)) else valeur
+                           for cle, valeur in ligne.items()})
+
+
+def _rayons(texte):
+    return [float(rayon) for rayon in texte.split(',')]
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Balayage de paramètres de la simulation")
+    parser.add_argument('--gravite', type=float, nargs='+')
+    parser.add_argument('--vitesse_commune', type=float, nargs='+')
+    parser.add_argument('--rayons', type=_rayons, nargs='+', metavar='R1,R2,...',
+                        help="dispositions de départ des cercles")
+    parser.add_argument('--angle_ouverture', type=float, nargs='+')
+    parser.add_argument('--vitesse_reduction', type=float, nargs='+')
+    parser.add_argument('--vitesse_min', type=float, nargs='+')
+    parser.add_argument('--graines', type=int, default=1, help="nombre de graines par configuration")
+    parser.add_argument('--duree', type=float, default=60.0, help="secondes simulées par exécution")
+    parser.add_argument('--dt', type=float, default=1 / 120)
+    parser.add_argument('--continue', dest='collision_continue', action='store_true',
+                        help="détection de collision continue")
+    parser.add_argument('--evenements', action='store_true',
+                        help="saute les pas sans contact (même partie qu'à pas fixes) : échappements "
+                             "seulement, 3 à 4 fois plus rapide avec les paramètres par défaut")
+    parser.add_argument('--processus', type=int, help="nombre de processus (par défaut : tous les cœurs)")
+    parser.add_argument('--sortie', help="fichier CSV (par défaut : sortie standard)")
+    options = parser.parse_args(arguments)
+    if options.evenements and options.collision_continue:
+        parser.error("--evenements saute les pas du mode discret : pas disponible avec --continue")
+
+    axes = {nom: getattr(options, nom) for nom in AXES if getattr(options, nom)}
+    configurations = grille(**axes)
+    resultats = balayer(configurations, range(options.graines), options.duree, options.dt,
+                        options.collision_continue, options.processus, options.evenements)
+    if options.sortie:
+        with open(options.sortie, 'w', newline='', encoding='utf-8') as fichier:
+            ecrire_csv(resultats, fichier)
+    else:
+        ecrire_csv(resultats, sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
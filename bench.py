@@ -0,0 +1,211 @@
+"""Mesures de performance des chemins critiques (physique et dessin), sans fenêtre.
+
+Chaque mesure donne le temps médian et minimal d'un appel (d'une image pour les
+scènes complètes de 11, 100 et 1000 cercles), en microsecondes.
+Les résultats s'écrivent en JSON et peuvent être comparés à une référence :
+
+    python bench.py --sortie reference.json
+    python bench.py --comparer reference.json --seuil 10
+
+Le code de sortie vaut 1 si une mesure est plus lente que la référence de plus
+de --seuil pour cent.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+# Pilote SDL factice : pas de fenêtre, même sur une machine sans affichage
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+from moteur import (
+    LARGEUR, HAUTEUR, NOIR, Balle, Cercle, IndexRadial, Simulation, creer_nouveau_cercle_exterieur,
+)
+from rendu import dessiner_balle, dessiner_cercle, dessiner_scene
+
+
+def mesurer(fonction, repetitions=7, duree_min=0.05):
+    """(médiane, minimum) en microsecondes par appel de fonction()"""
+    # Étalonnage : assez d'appels par répétition pour dépasser duree_min
+    n = 1
+    while True:
+        debut = time.perf_counter()
+        for _ in range(n):
+            fonction()
+        duree = time.perf_counter() - debut
+        if duree >= duree_min:
+            break
+        n *= 2 if duree < duree_min / 4 else 1 + int(duree_min / max(duree, 1e-9))
+    temps = [duree / n]
+    for _ in range(repetitions - 1):
+        debut = time.perf_counter()
+        for _ in range(n):
+            fonction()
+        temps.append((time.perf_counter() - debut) / n)
+    return statistics.median(temps) * 1e6, min(temps) * 1e6, n
+
+
+# Préparation de chaque mesure : renvoie la fonction à chronométrer
+def _dessin_cercle(ecran):
+    cercle = Cercle(LARGEUR // 2, HAUTEUR // 2, 300, (255, 0, 0), 120, random.Random(0))
+
+    def appel():
+        cercle.tourner(1 / 120)
+        dessiner_cercle(ecran, cercle.etat())
+    return appel
+
+
+def _collision(ecran):
+    cercle = Cercle(LARGEUR // 2, HAUTEUR // 2, 300, (255, 0, 0), 120, random.Random(0))
+    cercle.angle = 0  # Ouverture autour de 0°, la balle touche la partie pleine à 180°
+    balle = Balle(0, 0, 8, 0, 0)
+
+    def appel():
+        # Balle posée contre la paroi intérieure, vers l'extérieur : collision et rebond
+        balle.x, balle.y = cercle.x - cercle.rayon + balle.rayon, cercle.y
+        balle.vitesse_x, balle.vitesse_y = -200.0, 50.0
+        if cercle.verifier_collision(balle):
+            cercle.faire_rebondir(balle)
+    return appel
+
+
+def _deplacer(ecran):
+    balle = Balle(LARGEUR // 2, HAUTEUR // 2, 8, 200.0, -100.0)
+    rng = random.Random(0)
+
+    def appel():
+        balle.deplacer(1 / 120, 0, rng)
+        balle.x, balle.y = LARGEUR // 2, HAUTEUR // 2
+    return appel
+
+
+def _dessin_balle(ecran):
+    balle = Balle(LARGEUR // 2, HAUTEUR // 2, 8, 200.0, -100.0)
+    for i in range(balle.max_trainee):
+        balle.trainee.append((balle.x - 3 * i, balle.y + 2 * i))
+    etat = balle.etat()
+    return lambda: dessiner_balle(ecran, etat)
+
+
+def _nouveau_cercle(ecran):
+    # Bande 260-620 saturée : les deux plages de tirage sont pleines
+    rng = random.Random(0)
+    index = IndexRadial(Cercle(LARGEUR // 2, HAUTEUR // 2, rayon, (255, 0, 0), 120, rng)
+                        for rayon in range(260, 621, 4))
+    return lambda: creer_nouveau_cercle_exterieur(LARGEUR // 2, HAUTEUR // 2, index, rng)
+
+
+def _image(n_cercles, images=60):
+    def preparer(ecran):
+        # Rayons répartis entre 50 et 350 pixels
+        rayons = [350 - 300 * i / max(1, n_cercles - 1) for i in range(n_cercles)]
+
+        def appel():
+            # Toujours la même séquence d'images, depuis une simulation neuve de même graine
+            simulation = Simulation(LARGEUR, HAUTEUR, parametres={'rayons': rayons}, graine=0)
+            for _ in range(images):
+                simulation.pas(simulation.dt_fixe)
+                ecran.fill(NOIR)
+                dessiner_scene(ecran, simulation.instantane())
+        return appel, images
+    return preparer
+
+
+MESURES = {
+    'dessin_cercle': _dessin_cercle,
+    'collision_rebond': _collision,
+    'deplacer_balle': _deplacer,
+    'dessin_balle_trainee': _dessin_balle,
+    'nouveau_cercle_bande_pleine': _nouveau_cercle,
+    'image_11_cercles': _image(11),
+    'image_100_cercles': _image(100),
+    'image_1000_cercles': _image(1000),
+}
+
+
+def executer(noms=None, repetitions=7, duree_min=0.05):
+    """{nom: {'median_us', 'min_us', 'appels'}} pour les mesures demandées"""
+    pygame.display.init()
+    ecran = pygame.display.set_mode((LARGEUR, HAUTEUR))
+    resultats = {}
+    try:
+        for nom, preparer in MESURES.items():
+            if noms and nom not in noms:
+                continue
+            fonction = preparer(ecran)
+            # Une mesure peut regrouper plusieurs images par appel : temps ramené à une image
+            fonction, par_appel = fonction if isinstance(fonction, tuple) else (fonction, 1)
+            median, minimum, appels = mesurer(fonction, repetitions, duree_min)
+            resultats[nom] = {'median_us': median / par_appel, 'min_us': minimum / par_appel,
+                              'appels': appels * par_appel}
+    finally:
+        pygame.display.quit()
+    return resultats
+
+
+def comparer(resultats, reference, seuil=10.0):
+    """Lignes (nom, référence, actuel, écart en %) et noms des mesures en régression"""
+    lignes = []
+    regressions = []
+    for nom, mesure in resultats.items():
+        avant = reference.get(nom)
+        if avant is None:
+            lignes.append((nom, None, mesure['median_us'], None))
+            continue
+        ecart = (mesure['median_us'] / avant['median_us'] - 1) * 100
+        lignes.append((nom, avant['median_us'], mesure['median_us'], ecart))
+        if ecart > seuil:
+            regressions.append(nom)
+    return lignes, regressions
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Mesures de performance sans fenêtre")
+    parser.add_argument('mesures', nargs='*', metavar='MESURE',
+                        help=f"mesures à exécuter (par défaut : toutes) parmi {', '.join(MESURES)}")
+    parser.add_argument('--repetitions', type=int, default=7)
+    parser.add_argument('--duree_min', type=float, default=0.05, help="secondes minimales par répétition")
+    parser.add_argument('--sortie', help="fichier JSON des résultats")
+    parser.add_argument('--comparer', metavar='REFERENCE', help="fichier JSON de référence")
+    parser.add_argument('--seuil', type=float, default=10.0, help="régression tolérée en pour cent")
+    options = parser.parse_args(arguments)
+
+    inconnues = set(options.mesures) - set(MESURES)
+    if inconnues:
+        parser.error(f"mesures inconnues : {', '.join(sorted(inconnues))}")
+
+    resultats = executer(options.mesures, options.repetitions, options.duree_min)
+    if options.sortie:
+        with open(options.sortie, 'w', encoding='utf-8') as fichier:
+            json.dump({
+                'python': platform.python_version(),
+                'pygame': pygame.version.ver,
+                'machine': platform.machine(),
+                'resultats': resultats,
+            }, fichier, indent=1)
+
+    if not options.comparer:
+        for nom, mesure in resultats.items():
+            print(f"{nom:<30} {mesure['median_us']:10.1f} µs  (min {mesure['min_us']:.1f})")
+        return 0
+
+    with open(options.comparer, encoding='utf-8') as fichier:
+        reference = json.load(fichier)['resultats']
+    lignes, regressions = comparer(resultats, reference, options.seuil)
+    for nom, avant, apres, ecart in lignes:
+        if avant is None:
+            print(f"{nom:<30} {'':>10}    {apres:10.1f} µs  (nouvelle)")
+        else:
+            marque = '  RÉGRESSION' if nom in regressions else ''
+            print(f"{nom:<30} {avant:10.1f} -> {apres:10.1f} µs  {ecart:+6.1f} %{marque}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
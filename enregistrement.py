@@ -0,0 +1,106 @@
+"""Enregistrement et rejeu déterministes d'une partie.
+
+Format binaire (petit-boutiste) :
+
+- en-tête : b'BCR1', graine (u64), dt_fixe (f64), largeur (u16), hauteur (u16),
+  collision continue (u8), longueur (u32) puis paramètres physiques en JSON
+- puis une suite d'enregistrements d'un octet de type :
+  0 suivi du dt de l'image (f64), ou 1 + indice de la commande dans COMMANDES
+
+Rejouer la même graine, les mêmes dt et les mêmes commandes redonne exactement
+la même partie, sans fenêtre et aussi vite que possible.
+"""
+import json
+import struct
+import sys
+import time
+
+from moteur import COMMANDES, Simulation
+
+MAGIQUE = b'BCR1'
+EN_TETE = struct.Struct('<QdHHB')
+LONGUEUR = struct.Struct('<I')
+DT = struct.Struct('<d')
+TYPE_IMAGE = 0
+
+
+class Enregistreur:
+    """Écrit la graine, le flux de dt et les commandes d'une simulation neuve"""
+
+    def __init__(self, chemin, simulation):
+        if simulation.pas_effectues:
+            raise ValueError("L'enregistrement doit commencer avec une simulation neuve")
+        self.fichier = open(chemin, 'wb')
+        parametres = json.dumps(simulation.physique).encode('utf-8')
+        self.fichier.write(MAGIQUE)
+        self.fichier.write(EN_TETE.pack(simulation.graine, simulation.dt_fixe,
+                                        simulation.largeur, simulation.hauteur,
+                                        simulation.collision_continue))
+        self.fichier.write(LONGUEUR.pack(len(parametres)))
+        self.fichier.write(parametres)
+
+    def image(self, dt):
+        self.fichier.write(bytes((TYPE_IMAGE,)))
+        self.fichier.write(DT.pack(dt))
+
+    def commande(self, commande):
+        self.fichier.write(bytes((1 + COMMANDES.index(commande),)))
+
+    def fermer(self):
+        self.fichier.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+
+def lire(chemin):
+    """Renvoie (simulation neuve, liste des évènements) ; un évènement est un dt ou une commande"""
+    with open(chemin, 'rb') as fichier:
+        donnees = fichier.read()
+    if donnees[:4] != MAGIQUE:
+        raise ValueError(f"{chemin} n'est pas un enregistrement balle-cercle")
+
+    position = 4
+    graine, dt_fixe, largeur, hauteur, continue_ = EN_TETE.unpack_from(donnees, position)
+    position += EN_TETE.size
+    (longueur,) = LONGUEUR.unpack_from(donnees, position)
+    position += LONGUEUR.size
+    parametres = json.loads(donnees[position:position + longueur].decode('utf-8'))
+    position += longueur
+
+    simulation = Simulation(largeur, hauteur, dt_fixe, parametres,
+                            collision_continue=bool(continue_), graine=graine)
+
+    evenements = []
+    while position < len(donnees):
+        type_ = donnees[position]
+        position += 1
+        if type_ == TYPE_IMAGE:
+            evenements.append(DT.unpack_from(donnees, position)[0])
+            position += DT.size
+        else:
+            evenements.append(COMMANDES[type_ - 1])
+    return simulation, evenements
+
+
+def rejouer(chemin):
+    """Rejoue un enregistrement sans affichage et renvoie la simulation finale"""
+    simulation, evenements = lire(chemin)
+    for evenement in evenements:
+        if isinstance(evenement, str):
+            simulation.appliquer_commande(evenement)
+        else:
+            simulation.avancer(evenement)
+    return simulation
+
+
+if __name__ == '__main__':
+    debut = time.perf_counter()
+    simulation = rejouer(sys.argv[1])
+    duree = time.perf_counter() - debut
+    balle = simulation.balle
+    print(f"{simulation.pas_effectues} pas ({simulation.temps:.1f} s simulées) en {duree:.2f} s")
+    print(f"Balle : x={balle.x!r} y={balle.y!r} vx={balle.vitesse_x!r} vy={balle.vitesse_y!r}")
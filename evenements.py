@@ -0,0 +1,291 @@
+"""Simulation à pas sautés : les pas où rien ne peut arriver sont franchis d'un coup.
+
+Simulation avance à pas fixes et ne regarde les cercles et les murs qu'en fin de
+pas. Loin d'eux, un pas ne fait que déplacer la balle : sur la grille des pas,
+Euler semi-implicite (gravité, puis déplacement) la place exactement sur la
+parabole de vitesse initiale vitesse_y + gravite * dt / 2, et chaque cercle tourne
+à vitesse constante et rétrécit linéairement jusqu'à son rayon minimal. Une suite
+de tels pas a donc une forme close.
+
+Avant chaque saut, les racines du polynôme de contact donnent le premier pas où la
+balle peut atteindre la bande d'un cercle (rayon ± rayon de la balle + 2, la
+tolérance de Cercle.verifier_collision) ; les murs et la vitesse minimale sont des
+polynômes du second degré. Les pas d'avant sont sautés, les autres sont ceux du
+moteur discret lui-même : rebonds, ouvertures et échappements suivent les règles
+de Simulation sans les réécrire. Au même dt et avec la même graine, la partie ne
+s'écarte de celle de Simulation que par les arrondis des sauts, que le chaos
+amplifie ensuite comme toute autre différence d'arrondi.
+"""
+import math
+
+from moteur import LARGEUR, HAUTEUR, Simulation
+
+HORIZON = 1.0  # Durée maximale d'un saut (s)
+BANDE = 2  # Tolérance de contact de Cercle.verifier_collision au-delà du rayon de la balle (px)
+MARGE = 0.5  # Marge de sécurité sur les bandes, les murs et la vitesse minimale, contre les arrondis
+
+
+def valeur(coefficients, t):
+    """Polynôme (coefficients du plus haut degré au terme constant) évalué en t (Horner)"""
+    resultat = 0.0
+    for coefficient in coefficients:
+        resultat = resultat * t + coefficient
+    return resultat
+
+
+def derivee(coefficients):
+    degre = len(coefficients) - 1
+    return [coefficient * (degre - i) for i, coefficient in enumerate(coefficients[:-1])]
+
+
+def racines(coefficients, debut, fin):
+    """Racines réelles (changements de signe) du polynôme dans [debut, fin], triées
+
+    Les racines de la dérivée découpent l'intervalle en morceaux monotones, qui
+    contiennent chacun au plus une racine, trouvée par fausse position (Illinois).
+    """
+    while len(coefficients) > 1 and coefficients[0] == 0:
+        coefficients = coefficients[1:]
+    if len(coefficients) <= 1:
+        return []
+    if len(coefficients) == 2:
+        t = -coefficients[1] / coefficients[0]
+        return [t] if debut <= t <= fin else []
+    if len(coefficients) == 3:
+        # Degré 2 : forme close (stable numériquement), une racine double ne change pas de signe
+        a, b, c = coefficients
+        discriminant = b * b - 4 * a * c
+        if discriminant <= 0:
+            return []
+        q = -(b + math.copysign(math.sqrt(discriminant), b)) / 2
+        return sorted(t for t in (q / a, c / q) if debut <= t <= fin)
+
+    bornes = [debut, *racines(derivee(coefficients), debut, fin), fin]
+    trouvees = []
+    for gauche, droite in zip(bornes, bornes[1:]):
+        f_gauche = valeur(coefficients, gauche)
+        f_droite = valeur(coefficients, droite)
+        if f_gauche == 0:
+            trouvees.append(gauche)
+            continue
+        if f_gauche * f_droite > 0:
+            continue
+        if f_droite == 0:
+            trouvees.append(droite)
+            continue
+        # Fausse position modifiée : convergence rapide, la racine reste encadrée
+        cote = 0
+        for _ in range(100):
+            t = (gauche * f_droite - droite * f_gauche) / (f_droite - f_gauche)
+            f = valeur(coefficients, t)
+            if f == 0 or droite - gauche < 1e-12:
+                break
+            if f * f_droite > 0:
+                droite, f_droite = t, f
+                if cote == -1:
+                    f_gauche /= 2
+                cote = -1
+            else:
+                gauche, f_gauche = t, f
+                if cote == 1:
+                    f_droite /= 2
+                cote = 1
+        trouvees.append(t)
+    return sorted(set(trouvees))
+
+
+def premier_pas_positif(coefficients, pas, debut, fin):
+    """Plus petit entier i avec debut <= i * pas <= fin et polynôme(i * pas) >= 0, ou None
+
+    Entre deux racines le signe est constant : un point par morceau suffit.
+    """
+    bornes = [debut, *racines(coefficients, debut, fin), fin]
+    for gauche, droite in zip(bornes, bornes[1:]):
+        i = math.ceil(gauche / pas)
+        if i * pas <= droite and valeur(coefficients, (gauche + droite) / 2) >= 0:
+            return i
+    return None
+
+
+# Moteur à pas sautés
+class SimulationEvenements(Simulation):
+    """Même partie que Simulation au même dt, sans exécuter les pas où rien ne peut arriver"""
+
+    def __init__(self, largeur=LARGEUR, hauteur=HAUTEUR, dt_fixe=None, parametres=None, graine=None):
+        super().__init__(largeur, hauteur, dt_fixe, parametres, graine=graine)
+        self.pas_sautes = 0
+
+    # Trajectoire sur la grille des pas
+    def vitesse_y_trajet(self):
+        """Vitesse initiale de la parabole qui passe par les positions de fin de pas
+
+        Après i pas, Euler semi-implicite donne y + dt * (i vy + g dt i (i + 1) / 2),
+        soit la parabole y + (vy + g dt / 2) t + g t² / 2 prise en t = i dt.
+        """
+        return self.balle.vitesse_y + self.physique['gravite'] * self.dt_fixe / 2
+
+    def position(self, t):
+        balle = self.balle
+        return (balle.x + balle.vitesse_x * t,
+                balle.y + self.vitesse_y_trajet() * t + self.physique['gravite'] * t * t / 2)
+
+    # Nombre de pas sans contact
+    def pas_murs(self, n):
+        """Pas sûrs, au plus n, avant qu'une fin de pas n'arrive à MARGE d'un mur"""
+        balle = self.balle
+        dt = self.dt_fixe
+        gravite = self.physique['gravite']
+        b = self.vitesse_y_trajet()
+        limite = balle.rayon + MARGE
+        # Positifs quand la balle est trop près du mur : gauche, droit, haut, bas
+        for coefficients in ([-balle.vitesse_x, limite - balle.x],
+                             [balle.vitesse_x, balle.x - (self.largeur - limite)],
+                             [-gravite / 2, -b, limite - balle.y],
+                             [gravite / 2, b, balle.y - (self.hauteur - limite)]):
+            # rebondir_sur_bords voit la position après le déplacement : pas 1 à n
+            i = premier_pas_positif(coefficients, dt, dt, n * dt)
+            if i is not None:
+                n = i - 1
+        return n
+
+    def pas_vitesse_min(self, n):
+        """Pas sûrs, au plus n, avant que la vitesse n'arrive à MARGE de vitesse_min"""
+        balle = self.balle
+        dt = self.dt_fixe
+        gravite = self.physique['gravite']
+        seuil = self.physique['vitesse_min'] + MARGE
+        # seuil² - |v|² après la gravité du pas i, où vy = vitesse_y + g i dt
+        coefficients = [-gravite * gravite, -2 * gravite * balle.vitesse_y,
+                        seuil * seuil - balle.vitesse_x**2 - balle.vitesse_y**2]
+        i = premier_pas_positif(coefficients, dt, dt, n * dt)
+        return n if i is None else i - 1
+
+    def polynome_contact(self, rayon_contact, vitesse_reduction):
+        """|position(t) - centre|² - (rayon_contact - vitesse_reduction t)², de degré 4"""
+        balle = self.balle
+        qx = balle.x - self.centre_x
+        qy = balle.y - self.centre_y
+        vx, vy = balle.vitesse_x, self.vitesse_y_trajet()
+        h = self.physique['gravite'] / 2
+        s = vitesse_reduction
+        return [
+            h * h,
+            2 * vy * h,
+            vx * vx + vy * vy + 2 * qy * h - s * s,
+            2 * (qx * vx + qy * vy) + 2 * rayon_contact * s,
+            qx * qx + qy * qy - rayon_contact * rayon_contact,
+        ]
+
+    def rayon_pas_suivant(self, cercle):
+        """(rayon au pas suivant, vitesse de réduction à partir de là)"""
+        if cercle.rayon > cercle.rayon_min and cercle.vitesse_reduction:
+            return max(cercle.rayon - cercle.vitesse_reduction * self.dt_fixe, cercle.rayon_min), \
+                cercle.vitesse_reduction
+        return cercle.rayon, 0
+
+    def pas_cercle(self, cercle, distance, n):
+        """Pas sûrs, au plus n, avant que la balle n'arrive à MARGE de la bande du cercle
+
+        Au pas i, Cercle.verifier_collision voit la balle d'avant le déplacement
+        (fin du pas i - 1) et le cercle déjà avancé (pas i) : la bande suit le rayon
+        d'un pas plus tard. Une fin de pas est sûre tant que la balle reste du côté de
+        départ du bord proche de la bande ; au-delà, même si elle saute la bande
+        entière, les pas sont exécutés par le moteur discret.
+        """
+        dt = self.dt_fixe
+        largeur = self.balle.rayon + BANDE + MARGE
+        rayon, reduction = self.rayon_pas_suivant(cercle)
+        if abs(distance - rayon) <= largeur:
+            return 0
+        # Hors de portée pendant n pas : inutile de chercher les racines
+        balle = self.balle
+        duree = n * dt
+        portee = ((math.hypot(balle.vitesse_x, self.vitesse_y_trajet()) + reduction) * duree
+                  + abs(self.physique['gravite']) * duree * duree / 2)
+        if abs(distance - rayon) - largeur > portee:
+            return n
+
+        # Bord proche de la bande, positif du côté de la bande
+        signe = -1 if distance < rayon else 1
+        bord = rayon + signe * largeur
+        morceaux = [(0.0, duree, bord, reduction)]
+        if reduction:
+            # Le rayon décroît jusqu'à rayon_min, puis reste constant
+            fin_reduction = (rayon - cercle.rayon_min) / reduction
+            if fin_reduction < duree:
+                morceaux = [(0.0, fin_reduction, bord, reduction),
+                            (fin_reduction, duree, cercle.rayon_min + signe * largeur, 0)]
+        for debut, fin, bord, reduction in morceaux:
+            if reduction and bord - reduction * fin <= 0:
+                # La bande atteint le centre : aucune fin de pas n'est sûre au-delà
+                fin = bord / reduction
+                n = min(n, math.ceil(fin / dt))
+            elif bord <= 0:
+                return min(n, math.ceil(debut / dt))
+            coefficients = [-signe * c for c in self.polynome_contact(bord, reduction)]
+            i = premier_pas_positif(coefficients, dt, debut, fin)
+            if i is not None:
+                return min(n, i)
+        return n
+
+    def pas_libres(self, n):
+        """Nombre de pas, au plus n, sans contact, sans boost et sans mur"""
+        # Traversée en cours : Cercle.verifier_collision doit voir chaque pas
+        if any(cercle.dans_ouverture for cercle in self.cercles):
+            return 0
+        # La balle n'atteint un autre cercle qu'en traversant la bande de l'un des
+        # deux qui l'encadrent : tous rétrécissent à la même vitesse
+        balle = self.balle
+        distance = math.sqrt((balle.x - self.centre_x)**2 + (balle.y - self.centre_y)**2)
+        encadrants = self.index.encadrants(distance)
+        largeur = balle.rayon + BANDE + MARGE
+        # Déjà dans une bande (souvent juste après un rebond) : inutile de chercher plus loin
+        if any(abs(distance - self.rayon_pas_suivant(cercle)[0]) <= largeur for cercle in encadrants):
+            return 0
+        n = self.pas_murs(n)
+        n = self.pas_vitesse_min(n)
+        for cercle in encadrants:
+            if n == 0:
+                break
+            n = self.pas_cercle(cercle, distance, n)
+        return n
+
+    def sauter(self, n):
+        """Les n prochains pas d'un coup : aucun ne touche un cercle, un mur ou la vitesse minimale"""
+        balle = self.balle
+        dt = self.dt_fixe
+        duree = n * dt
+        # Traînée : position de début de chaque pas, comme Balle.deplacer
+        for i in range(max(0, n - balle.max_trainee), n):
+            balle.trainee.append(self.position(i * dt))
+        balle.x, balle.y = self.position(duree)
+        balle.vitesse_y += self.physique['gravite'] * duree
+        for cercle in self.cercles:
+            cercle.tourner(duree)
+            cercle.reduire_taille(duree)
+        self.index.reordonner()
+        self.effets.update(duree)
+        self.temps += duree
+        self.pas_effectues += n
+        self.pas_sautes += n
+
+    def avancer_jusqua(self, fin):
+        """Avance jusqu'au temps simulé fin par pas de dt_fixe, sautés ou exécutés"""
+        restants = int(round((fin - self.temps) / self.dt_fixe))
+        saut_max = max(1, int(HORIZON / self.dt_fixe))
+        while restants > 0:
+            n_max = min(restants, saut_max)
+            n = self.pas_libres(n_max)
+            if n > 0:
+                self.sauter(n)
+                restants -= n
+                if n == n_max:
+                    continue
+            # Saut interrompu : le pas suivant a un contact possible, inutile de le prévoir
+            if restants > 0:
+                Simulation.pas(self, self.dt_fixe)
+                restants -= 1
+
+    def pas(self, dt):
+        """Compatibilité avec la boucle du jeu et l'export : dt secondes d'un coup"""
+        self.avancer_jusqua(self.temps + dt)
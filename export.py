@@ -0,0 +1,143 @@
+"""Export hors écran de la simulation, image par image, à pas de temps fixe.
+
+Le rendu se fait dans des surfaces hors écran qui tournent dans un petit pool :
+le fil principal simule et dessine, un fil d'écriture envoie les pixels sur le
+disque directement depuis le tampon de la surface (sans copie), puis rend la
+surface au pool. Aucune image n'est perdue : si l'écriture prend du retard,
+le rendu attend qu'une surface se libère.
+
+Exemple :
+
+    python export.py --duree 30 --fps 60 --sortie partie.raw
+    ffmpeg -f rawvideo -pix_fmt bgr0 -s 1900x1000 -r 60 -i partie.raw partie.mp4
+"""
+import argparse
+import os
+import queue
+import threading
+import time
+
+import pygame
+
+from moteur import LARGEUR, HAUTEUR, NOIR, Simulation
+from rendu import Hud, dessiner_scene
+
+
+def format_pixels(surface):
+    """Nom ffmpeg (-pix_fmt) de l'ordre des octets en mémoire d'une surface 32 bits"""
+    masques = dict(zip(surface.get_masks(), 'rgba'))
+    return ''.join(masques.get(0xff << (8 * octet), '0') for octet in range(4))
+
+
+# Fil d'écriture des images
+class EcrivainImages(threading.Thread):
+    """Consomme les surfaces pleines, écrit leurs pixels et les rend au pool des surfaces libres"""
+
+    def __init__(self, destination, mode, pleines, libres):
+        super().__init__(name='ecrivain-images', daemon=True)
+        self.destination = destination
+        self.mode = mode
+        self.pleines = pleines
+        self.libres = libres
+        self.erreur = None
+        self.images_ecrites = 0
+
+    def run(self):
+        fichier = open(self.destination, 'wb') if self.mode == 'brut' else None
+        try:
+            while True:
+                element = self.pleines.get()
+                if element is None:
+                    break
+                numero, surface = element
+                if self.erreur is None:
+                    try:
+                        if fichier:
+                            # Le tampon de la surface est écrit tel quel, sans copie
+                            fichier.write(surface.get_buffer())
+                        else:
+                            pygame.image.save(surface, os.path.join(self.destination, f'image_{numero:06d}.png'))
+                        self.images_ecrites += 1
+                    except Exception as erreur:
+                        self.erreur = erreur
+                self.libres.put(surface)
+        finally:
+            if fichier:
+                fichier.close()
+
+
+class Exporteur:
+    """Simule à pas fixe et dessine chaque image dans une surface hors écran"""
+
+    def __init__(self, simulation, destination, fps=60, mode='brut', taille_file=8, hud=False):
+        if mode not in ('brut', 'png'):
+            raise ValueError(f"Mode d'export inconnu : {mode}")
+        if mode == 'png':
+            os.makedirs(destination, exist_ok=True)
+        self.simulation = simulation
+        self.fps = fps
+        self.pleines = queue.Queue(maxsize=taille_file)
+        self.libres = queue.Queue()
+        taille = (simulation.largeur, simulation.hauteur)
+        for _ in range(taille_file + 2):
+            self.libres.put(pygame.Surface(taille))
+        self.format = format_pixels(self.libres.queue[0])
+        self.hud = None
+        if hud:
+            pygame.font.init()
+            self.hud = Hud(pygame.font.Font(None, 28), pygame.font.Font(None, 20))
+        self.ecrivain = EcrivainImages(destination, mode, self.pleines, self.libres)
+
+    def exporter(self, duree):
+        """Exporte duree secondes de simulation ; renvoie le nombre d'images écrites"""
+        simulation = self.simulation
+        self.ecrivain.start()
+        try:
+            for numero in range(int(round(duree * self.fps))):
+                simulation.avancer(1 / self.fps)
+                etat = simulation.instantane()
+
+                # Attend une surface libre : l'écriture impose son rythme sans perdre d'image
+                surface = self.libres.get()
+                surface.fill(NOIR)
+                dessiner_scene(surface, etat)
+                if self.hud:
+                    self.hud.dessiner(surface, etat, simulation.physique, self.fps,
+                                      simulation.energie(), simulation.balle.max_trainee)
+                self.pleines.put((numero, surface))
+                if self.ecrivain.erreur:
+                    break
+        finally:
+            self.pleines.put(None)
+            self.ecrivain.join()
+        if self.ecrivain.erreur:
+            raise self.ecrivain.erreur
+        return self.ecrivain.images_ecrites
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Export hors écran de la simulation")
+    parser.add_argument('--duree', type=float, default=10.0, help="secondes de simulation à exporter")
+    parser.add_argument('--fps', type=int, default=60)
+    parser.add_argument('--graine', type=int)
+    parser.add_argument('--largeur', type=int, default=LARGEUR)
+    parser.add_argument('--hauteur', type=int, default=HAUTEUR)
+    parser.add_argument('--hud', action='store_true', help="dessiner aussi les informations")
+    parser.add_argument('--png', action='store_true', help="séquence d'images PNG dans le dossier de sortie")
+    parser.add_argument('--sortie', required=True, help="fichier d'images brutes, ou dossier avec --png")
+    options = parser.parse_args(arguments)
+
+    simulation = Simulation(options.largeur, options.hauteur, graine=options.graine)
+    exporteur = Exporteur(simulation, options.sortie, options.fps,
+                          'png' if options.png else 'brut', hud=options.hud)
+    debut = time.perf_counter()
+    n = exporteur.exporter(options.duree)
+    duree = time.perf_counter() - debut
+    print(f"{n} images en {duree:.1f} s ({n / duree:.0f} images/s, graine {simulation.graine})")
+    if not options.png:
+        print(f"ffmpeg -f rawvideo -pix_fmt {exporteur.format} -s {options.largeur}x{options.hauteur} "
+              f"-r {options.fps} -i {options.sortie} sortie.mp4")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,776 @@
+import math
+import random
+from bisect import bisect_left, bisect_right, insort
+from collections import deque, namedtuple
+
+# Dimensions par défaut du monde simulé (identiques à la fenêtre du jeu)
+LARGEUR = 1900
+HAUTEUR = 1000
+
+# Couleurs
+NOIR = (0, 0, 0)
+BLANC = (255, 255, 255)
+ROUGE = (255, 0, 0)
+VERT = (0, 255, 0)
+BLEU = (0, 0, 255)
+JAUNE = (255, 255, 0)
+CYAN = (0, 255, 255)
+MAGENTA = (255, 0, 255)
+
+# Disposition initiale des cercles concentriques
+couleurs = [ROUGE, VERT, BLEU, JAUNE, CYAN, MAGENTA]
+
+# Cercles très rapprochés (écart de 25 pixels)
+rayons = [300, 275, 250, 225, 200, 175, 150, 125, 100, 75, 50]
+vitesse_commune = 120  # Degrés par seconde
+
+# Paramètres physiques par défaut (chaque Simulation en garde sa propre copie)
+physique = {
+    'gravite': 400,  # Gravité en pixels/s²
+    'fps_cible': 120,  # FPS cible pour le jeu (augmenté)
+    'vitesse_commune': vitesse_commune,  # Rotation des cercles en degrés/seconde
+    'rayons': rayons,  # Rayons des cercles au départ
+    'angle_ouverture': 60,  # Angle de l'ouverture en degrés
+    'vitesse_reduction': 10,  # Rétrécissement des cercles en pixels/seconde
+    'vitesse_min': 180.0,  # Vitesse minimale de la balle en pixels/seconde
+}
+
+# Commandes qui modifient la simulation (touches du jeu), dans l'ordre des codes enregistrés
+COMMANDES = (
+    'reinitialiser_cercles',  # ESPACE
+    'reinitialiser_balle',  # R
+    'basculer_pause',  # P
+    'inverser_gravite',  # G
+    'basculer_gravite',  # N
+    'allonger_trainee',  # T
+    'raccourcir_trainee',  # Y
+    'effacer_trainee',  # C
+)
+
+# Instantanés immuables de l'état, lus par le rendu
+EtatBalle = namedtuple('EtatBalle', 'x y rayon couleur vitesse_x vitesse_y trainee')
+EtatCercle = namedtuple('EtatCercle', 'x y rayon couleur angle angle_ouverture epaisseur actif')
+EtatEffet = namedtuple('EtatEffet', 'x y rayon couleur alpha expansion')
+# balles : balles supplémentaires (mode multi-arènes), vide pour la partie à une balle
+Instantane = namedtuple('Instantane', 'temps balle cercles effets balles', defaults=((),))
+
+
+def est_dans_ouverture(angle, debut, fin):
+    """Vérifie si un angle est dans l'ouverture"""
+    angle = angle % 360
+    if debut <= fin:
+        return debut <= angle <= fin
+    else:
+        return angle >= debut or angle <= fin
+
+
+# Classe pour la balle
+class Balle:
+    # Attributs fixes : pas de __dict__ par instance, accès plus rapide
+    __slots__ = ('x', 'y', 'rayon', 'vitesse_x', 'vitesse_y', 'couleur', 'max_trainee', 'trainee')
+
+    def __init__(self, x, y, rayon, vitesse_x, vitesse_y):
+        self.x = x
+        self.y = y
+        self.rayon = rayon
+        self.vitesse_x = vitesse_x
+        self.vitesse_y = vitesse_y
+        self.couleur = BLANC
+        self.max_trainee = 30  # Nombre maximum de positions dans la traînée
+        # Tampon circulaire : les positions les plus anciennes sortent toutes seules
+        self.trainee = deque(maxlen=self.max_trainee)
+
+    def ajuster_trainee(self, max_trainee):
+        # Changer la capacité en conservant les positions les plus récentes
+        self.max_trainee = max(0, max_trainee)
+        self.trainee = deque(self.trainee, maxlen=self.max_trainee)
+
+    def appliquer_gravite(self, dt, gravite):
+        # Gravité appliquée avec delta time
+        self.vitesse_y += gravite * dt
+
+    def deplacer(self, dt, gravite, rng=random, vitesse_min=180.0):
+        # Ajouter la position actuelle à la traînée (limitée par maxlen)
+        self.trainee.append((self.x, self.y))
+
+        # Appliquer la gravité
+        self.appliquer_gravite(dt, gravite)
+
+        # Déplacer la balle avec delta time
+        self.x += self.vitesse_x * dt
+        self.y += self.vitesse_y * dt
+
+        # Vérifier la vitesse minimale pour éviter que la balle s'arrête
+        vitesse_totale = math.sqrt(self.vitesse_x**2 + self.vitesse_y**2)
+
+        if vitesse_totale < vitesse_min:
+            # Donner un boost aléatoire à la balle
+            if vitesse_totale > 0:
+                # Normaliser et multiplier par la vitesse minimale
+                self.vitesse_x = (self.vitesse_x / vitesse_totale) * vitesse_min
+                self.vitesse_y = (self.vitesse_y / vitesse_totale) * vitesse_min
+            else:
+                # Si complètement arrêtée, donner une direction aléatoire
+                angle = rng.uniform(0, 2 * math.pi)
+                self.vitesse_x = vitesse_min * math.cos(angle)
+                self.vitesse_y = vitesse_min * math.sin(angle)
+
+            # Ajouter une petite variation pour éviter les boucles
+            self.vitesse_x += rng.uniform(-30, 30)
+            self.vitesse_y += rng.uniform(-30, 30)
+
+    def etat(self):
+        return EtatBalle(self.x, self.y, self.rayon, self.couleur,
+                         self.vitesse_x, self.vitesse_y, tuple(self.trainee))
+
+# Classe pour les cercles
+class Cercle:
+    __slots__ = ('x', 'y', 'rayon', 'rayon_initial', 'rayon_min', 'couleur', 'angle', 'vitesse_rotation',
+                 'actif', 'epaisseur', 'angle_ouverture', 'dans_ouverture', 'vitesse_reduction',
+                 'vient_de_disparaitre')
+
+    def __init__(self, x, y, rayon, couleur, vitesse_rotation, rng=random):
+        self.x = x
+        self.y = y
+        self.rayon = rayon
+        self.rayon_initial = rayon
+        self.rayon_min = 30  # Rayon minimum
+        self.couleur = couleur
+        self.angle = rng.randint(0, 360)
+        self.vitesse_rotation = vitesse_rotation  # En degrés/seconde
+        self.actif = True
+        self.epaisseur = 5  # Cercles épais
+        self.angle_ouverture = 60  # Angle de l'ouverture
+        self.dans_ouverture = False  # Pour suivre si la balle est dans l'ouverture
+        self.vitesse_reduction = 10  # Pixels par seconde
+        # Passage d'actif à inactif pas encore traité (effet, comptage, remplacement)
+        self.vient_de_disparaitre = False
+
+    def tourner(self, dt):
+        self.angle += self.vitesse_rotation * dt  # Maintenant en degrés/seconde
+        self.angle = self.angle % 360
+
+    def reduire_taille(self, dt):
+        # Réduire progressivement la taille du cercle
+        if self.actif and self.rayon > self.rayon_min:
+            # Réduction basée sur le temps
+            self.rayon -= self.vitesse_reduction * dt
+            if self.rayon < self.rayon_min:
+                self.rayon = self.rayon_min
+
+    def est_dans_ouverture(self, angle, debut, fin):
+        """Vérifie si un angle est dans l'ouverture"""
+        return est_dans_ouverture(angle, debut, fin)
+
+    def verifier_collision(self, balle):
+        if not self.actif:
+            return False
+
+        # Calculer la distance et l'angle
+        dx = balle.x - self.x
+        dy = balle.y - self.y
+        distance = math.sqrt(dx * dx + dy * dy)
+
+        # Vérifier si la balle touche le cercle
+        touche_cercle = abs(distance - self.rayon) <= balle.rayon + 2
+
+        if touche_cercle:
+            # Calculer l'angle de la balle
+            angle_balle = math.degrees(math.atan2(dy, dx)) % 360
+
+            # Vérifier si la balle est dans l'ouverture
+            angle_debut = (self.angle - self.angle_ouverture / 2) % 360
+            angle_fin = (self.angle + self.angle_ouverture / 2) % 360
+
+            balle_dans_ouverture = self.est_dans_ouverture(angle_balle, angle_debut, angle_fin)
+
+            if balle_dans_ouverture:
+                if not self.dans_ouverture:
+                    # La balle vient d'entrer dans l'ouverture
+                    self.dans_ouverture = True
+                return False  # Pas de collision dans l'ouverture
+            else:
+                # La balle touche la partie solide
+                if self.dans_ouverture:
+                    # La balle était dans l'ouverture et maintenant elle ne l'est plus
+                    # Elle a donc traversé le cercle
+                    self.disparaitre()
+                    return False
+                self.dans_ouverture = False
+                return True  # Collision avec la partie solide
+        else:
+            # La balle ne touche pas le cercle
+            if self.dans_ouverture and (distance > self.rayon + balle.rayon or distance < self.rayon - balle.rayon):
+                # La balle était dans l'ouverture et s'est éloignée = traversée
+                self.disparaitre()
+            self.dans_ouverture = False
+
+        return False
+
+    def disparaitre(self):
+        self.actif = False
+        self.vient_de_disparaitre = True
+
+    def faire_rebondir(self, balle):
+        # Direction de la normale
+        dx = balle.x - self.x
+        dy = balle.y - self.y
+        distance = math.sqrt(dx * dx + dy * dy)
+
+        if distance != 0:
+            # Normaliser
+            nx = dx / distance
+            ny = dy / distance
+
+            # Produit scalaire
+            dot = balle.vitesse_x * nx + balle.vitesse_y * ny
+
+            # Rebond uniquement si nécessaire
+            if (distance < self.rayon and dot > 0) or (distance > self.rayon and dot < 0):
+                # Appliquer le rebond parfait (conservation de l'énergie)
+                balle.vitesse_x = balle.vitesse_x - 2 * dot * nx
+                balle.vitesse_y = balle.vitesse_y - 2 * dot * ny
+
+                # Replacer la balle pour éviter qu'elle reste coincée
+                if distance < self.rayon:
+                    # À l'intérieur
+                    balle.x = self.x + nx * (self.rayon - balle.rayon - 1)
+                    balle.y = self.y + ny * (self.rayon - balle.rayon - 1)
+                else:
+                    # À l'extérieur
+                    balle.x = self.x + nx * (self.rayon + balle.rayon + 1)
+                    balle.y = self.y + ny * (self.rayon + balle.rayon + 1)
+
+    def temps_impact(self, balle, duree):
+        """Premier instant de contact (0 < t <= duree) entre la balle et l'anneau, ou None
+
+        Seuls comptent les passages vers la zone de contact : le bord extérieur en
+        venant de l'extérieur, le bord intérieur en venant de l'intérieur. Une balle
+        que faire_rebondir vient de replacer contre un bord et qui s'en éloigne ne
+        compte donc pas, mais le cercle reste prévu pour le côté opposé.
+        """
+        if not self.actif:
+            return None
+
+        qx = balle.x - self.x
+        qy = balle.y - self.y
+
+        # Le rayon diminue linéairement pendant le pas
+        s = self.vitesse_reduction if self.rayon > self.rayon_min else 0
+        vx, vy = balle.vitesse_x, balle.vitesse_y
+        premier = None
+        # Bords extérieur et intérieur de la zone de contact : |q + v t| = (rayon ± r) - s t,
+        # atteints quand f(t) = |q + v t|² - (a - s t)² décroît (extérieur) ou croît (intérieur)
+        for a, sens in ((self.rayon + balle.rayon, -1), (self.rayon - balle.rayon, 1)):
+            if a <= 0:
+                continue
+            A = vx * vx + vy * vy - s * s
+            B = 2 * (qx * vx + qy * vy + a * s)
+            C = qx * qx + qy * qy - a * a
+            if abs(A) < 1e-12:
+                racines = (-C / B,) if B != 0 else ()
+            else:
+                discriminant = B * B - 4 * A * C
+                if discriminant < 0:
+                    continue
+                racine = math.sqrt(discriminant)
+                racines = ((-B - racine) / (2 * A), (-B + racine) / (2 * A))
+            for t in racines:
+                if (1e-9 < t <= duree and (2 * A * t + B) * sens > 0 and a - s * t > 0
+                        and (premier is None or t < premier)):
+                    premier = t
+        return premier
+
+    def etat(self):
+        return EtatCercle(self.x, self.y, self.rayon, self.couleur, self.angle,
+                          self.angle_ouverture, self.epaisseur, self.actif)
+
+# Classe pour les effets visuels
+class EffetDisparition:
+    def __init__(self, x, y, rayon, couleur):
+        self.reinitialiser(x, y, rayon, couleur)
+
+    def reinitialiser(self, x, y, rayon, couleur):
+        # Remettre l'effet à son début (réutilisation par PoolEffets)
+        self.x = x
+        self.y = y
+        self.rayon = rayon
+        self.couleur = couleur
+        self.alpha = 255
+        self.expansion = 0
+
+    def update(self, dt):
+        self.alpha -= 480 * dt  # 8 * 60 pour normaliser
+        self.expansion += 120 * dt  # 2 * 60 pour normaliser
+        return self.alpha > 0
+
+    def etat(self):
+        return EtatEffet(self.x, self.y, self.rayon, self.couleur, self.alpha, self.expansion)
+
+
+# Réserve d'effets réutilisables
+class PoolEffets:
+    """Effets de disparition recyclés, avec un nombre maximal d'effets vivants"""
+
+    def __init__(self, max_effets=32):
+        self.max_effets = max_effets
+        self.actifs = []
+        self.libres = []
+
+    def __iter__(self):
+        return iter(self.actifs)
+
+    def __len__(self):
+        return len(self.actifs)
+
+    def emettre(self, x, y, rayon, couleur):
+        if len(self.actifs) >= self.max_effets:
+            # Trop d'effets en même temps : recycler le plus ancien
+            effet = self.actifs.pop(0)
+            effet.reinitialiser(x, y, rayon, couleur)
+        elif self.libres:
+            effet = self.libres.pop()
+            effet.reinitialiser(x, y, rayon, couleur)
+        else:
+            effet = EffetDisparition(x, y, rayon, couleur)
+        self.actifs.append(effet)
+        return effet
+
+    def update(self, dt):
+        # Compacter sur place : les effets terminés retournent dans la réserve
+        actifs = self.actifs
+        n = 0
+        for effet in actifs:
+            if effet.update(dt):
+                actifs[n] = effet
+                n += 1
+            else:
+                self.libres.append(effet)
+        del actifs[n:]
+
+    def clear(self):
+        self.libres.extend(self.actifs)
+        self.actifs.clear()
+
+
+def _rayon(cercle):
+    return cercle.rayon
+
+
+# Index radial des cercles concentriques
+class IndexRadial:
+    """Cercles actifs triés par rayon, pour ne tester que ceux proches de la balle"""
+
+    def __init__(self, cercles=()):
+        self.cercles = sorted((c for c in cercles if c.actif), key=_rayon)
+        self.vitesse_reduction_max = max((c.vitesse_reduction for c in self.cercles), default=0)
+
+    def __len__(self):
+        return len(self.cercles)
+
+    def ajouter(self, cercle):
+        insort(self.cercles, cercle, key=_rayon)
+        self.vitesse_reduction_max = max(self.vitesse_reduction_max, cercle.vitesse_reduction)
+
+    def retirer(self, cercle):
+        # Chercher autour de son rayon, puis en dernier recours dans toute la liste
+        i = bisect_left(self.cercles, cercle.rayon, key=_rayon)
+        while i < len(self.cercles) and self.cercles[i].rayon <= cercle.rayon:
+            if self.cercles[i] is cercle:
+                del self.cercles[i]
+                return
+            i += 1
+        self.cercles.remove(cercle)
+
+    def reordonner(self):
+        """Rétablit l'ordre après réduction des rayons (O(n) si l'ordre est conservé)"""
+        cercles = self.cercles
+        for i in range(1, len(cercles)):
+            cercle = cercles[i]
+            j = i
+            while j > 0 and cercles[j - 1].rayon > cercle.rayon:
+                cercles[j] = cercles[j - 1]
+                j -= 1
+            cercles[j] = cercle
+
+    def encadrants(self, rayon, tolerance=1e-6):
+        """Cercles les plus proches en dessous et au-dessus de rayon (avec les ex æquo)"""
+        cercles = self.cercles
+        i = bisect_left(cercles, rayon, key=_rayon)
+        proches = []
+        if i > 0:
+            proches += self.entre(cercles[i - 1].rayon - tolerance, cercles[i - 1].rayon)
+        if i < len(cercles):
+            proches += self.entre(cercles[i].rayon, cercles[i].rayon + tolerance)
+        return proches
+
+    def entre(self, rayon_min, rayon_max):
+        """Cercles dont le rayon est dans [rayon_min, rayon_max], en O(log n)"""
+        debut = bisect_left(self.cercles, rayon_min, key=_rayon)
+        fin = bisect_right(self.cercles, rayon_max, lo=debut, key=_rayon)
+        return self.cercles[debut:fin]
+
+
+def intervalles_libres(rayons_occupes, debut, fin, marge=20):
+    """Plages de rayons entiers de [debut, fin] à au moins marge pixels des rayons occupés"""
+    libres = []
+    suivant = debut  # Plus petit rayon encore disponible
+    for rayon in sorted(rayons_occupes):
+        # Rayons interdits : |r - rayon| < marge
+        bas = math.floor(rayon - marge) + 1
+        haut = math.ceil(rayon + marge) - 1
+        if haut < suivant:
+            continue
+        if bas > fin:
+            break
+        if bas > suivant:
+            libres.append((suivant, bas - 1))
+        suivant = max(suivant, haut + 1)
+    if suivant <= fin:
+        libres.append((suivant, fin))
+    return libres
+
+
+def choisir_rayon_libre(rayons_occupes, debut, fin, marge=20, rng=random):
+    """Rayon tiré uniformément parmi les rayons libres, ou None s'il n'y en a aucun"""
+    libres = intervalles_libres(rayons_occupes, debut, fin, marge)
+    total = sum(haut - bas + 1 for bas, haut in libres)
+    if total == 0:
+        return None
+    k = rng.randrange(total)
+    for bas, haut in libres:
+        if k <= haut - bas:
+            return bas + k
+        k -= haut - bas + 1
+
+
+# Fonction pour créer un nouveau cercle à l'extérieur
+def creer_nouveau_cercle_exterieur(centre_x, centre_y, cercles_existants, rng=random,
+                                   vitesse_rotation=vitesse_commune, echelle=1):
+    # Plages de rayons et marge à l'échelle de l'arène (1 : plein écran)
+    normal = (round(280 * echelle), round(320 * echelle))
+    grand = (round(400 * echelle), round(600 * echelle))
+    marge = 20 * echelle
+
+    # Cercles actifs qui peuvent gêner (l'index radial évite de parcourir tous les cercles)
+    if isinstance(cercles_existants, IndexRadial):
+        proches = cercles_existants.entre(normal[0] - marge, grand[1] + marge)
+    else:
+        proches = cercles_existants
+    rayons_occupes = [cercle.rayon for cercle in proches if cercle.actif]
+
+    # D'abord chercher dans la plage normale (280-320), avec une marge de sécurité de 20 pixels
+    rayon = choisir_rayon_libre(rayons_occupes, *normal, marge, rng)
+
+    # S'il n'y a plus de place, créer un cercle très grand (hors écran)
+    # Il deviendra visible en rétrécissant
+    if rayon is None:
+        rayon = choisir_rayon_libre(rayons_occupes, *grand, marge, rng)
+    if rayon is None:
+        rayon = rng.randint(*grand)  # Bande saturée : chevauchement accepté
+
+    couleur = rng.choice([ROUGE, VERT, BLEU, JAUNE, CYAN, MAGENTA])
+    vitesse = vitesse_rotation if rng.random() < 0.5 else -vitesse_rotation
+    return Cercle(centre_x, centre_y, rayon, couleur, vitesse, rng)
+
+
+def rebondir_sur_bords(balle, gauche, haut, droite, bas):
+    # Rebonds sur les bords du rectangle (conservation parfaite de l'énergie)
+    if balle.x - balle.rayon <= gauche or balle.x + balle.rayon >= droite:
+        balle.vitesse_x = -balle.vitesse_x
+        if balle.x - balle.rayon <= gauche:
+            balle.x = gauche + balle.rayon
+        else:
+            balle.x = droite - balle.rayon
+
+    if balle.y - balle.rayon <= haut or balle.y + balle.rayon >= bas:
+        balle.vitesse_y = -balle.vitesse_y
+
+        # Boost supplémentaire au rebond du bas pour compenser la gravité
+        if balle.y + balle.rayon >= bas and abs(balle.vitesse_y) < 300:
+            balle.vitesse_y = -300  # Vitesse minimale vers le haut en pixels/seconde
+
+        if balle.y - balle.rayon <= haut:
+            balle.y = haut + balle.rayon
+        else:
+            balle.y = bas - balle.rayon
+
+
+# Moteur de simulation sans affichage, à pas de temps fixe
+class Simulation:
+    """Fait avancer la balle, les cercles et les effets à pas de temps fixe"""
+
+    def __init__(self, largeur=LARGEUR, hauteur=HAUTEUR, dt_fixe=None, parametres=None,
+                 collision_continue=False, graine=None):
+        # Générateur propre à la simulation : même graine, même partie
+        if graine is None:
+            graine = random.randrange(2**63)
+        self.graine = graine
+        self.rng = random.Random(graine)
+        self.largeur = largeur
+        self.hauteur = hauteur
+        self.physique = dict(physique)
+        if parametres:
+            self.physique.update(parametres)
+        # Par défaut, un pas de physique par image au FPS cible
+        self.dt_fixe = dt_fixe if dt_fixe is not None else 1.0 / self.physique['fps_cible']
+        self.dt_max = 0.25  # Temps réel maximal absorbé en un appel (évite la spirale)
+        self.accumulateur = 0.0
+        # Détection continue : découpe le pas aux instants d'impact prévus
+        self.collision_continue = collision_continue
+        self.sous_pas_max = 16
+        self.pas_continus_epuises = 0  # Pas finis en sous-pas discrets, faute de sous-pas prévus
+        self.profileur = None  # Profileur optionnel, chronomètre chaque phase du pas
+        self.en_pause = False
+        self.temps = 0.0
+        self.pas_effectues = 0
+        # Statistiques : cercles traversés par la balle
+        self.cercles_echappes = 0
+        self.temps_premier_echappement = None
+
+        # Centre de l'écran
+        self.centre_x = largeur // 2
+        self.centre_y = hauteur // 2
+
+        self.balle = None
+        self.cercles = []
+        self.effets = PoolEffets()
+        self.reinitialiser_balle()
+        self.reinitialiser_cercles()
+
+    def reinitialiser_balle(self):
+        # Balle au centre exact avec une vitesse aléatoire
+        if self.balle is None:
+            self.balle = Balle(self.centre_x, self.centre_y, 8, 0, 0)
+        self.balle.x = self.centre_x
+        self.balle.y = self.centre_y
+        self.balle.vitesse_x = self.rng.uniform(-300, 300)  # Vitesse en pixels/seconde
+        self.balle.vitesse_y = self.rng.uniform(-120, 120)  # Vitesse verticale en pixels/seconde
+        self.balle.trainee.clear()  # Effacer la traînée
+
+    def reinitialiser_cercles(self):
+        # Création de cercles concentriques
+        self.cercles.clear()
+        vitesse_rotation = self.physique['vitesse_commune']
+        for i, rayon in enumerate(self.physique['rayons']):
+            couleur = couleurs[i % len(couleurs)]
+            # Alternance du sens de rotation
+            vitesse = vitesse_rotation if i % 2 == 0 else -vitesse_rotation
+            self.cercles.append(self.configurer_cercle(
+                Cercle(self.centre_x, self.centre_y, rayon, couleur, vitesse, self.rng)))
+        self.effets.clear()
+        self.index = IndexRadial(self.cercles)
+        # Position de chaque cercle dans la liste, pour les traiter dans l'ordre de la liste
+        self.positions = {id(cercle): i for i, cercle in enumerate(self.cercles)}
+        # Cercles dont la balle occupe l'ouverture : à suivre même hors de portée
+        self.cercles_suivis = []
+
+    def configurer_cercle(self, cercle):
+        # Ouverture et rétrécissement selon les paramètres de la simulation
+        cercle.angle_ouverture = self.physique['angle_ouverture']
+        cercle.vitesse_reduction = self.physique['vitesse_reduction']
+        return cercle
+
+    def nouveau_cercle_exterieur(self, cercles_existants):
+        return self.configurer_cercle(creer_nouveau_cercle_exterieur(
+            self.centre_x, self.centre_y, cercles_existants, self.rng,
+            self.physique['vitesse_commune']))
+
+    def inverser_gravite(self):
+        self.physique['gravite'] = -self.physique['gravite']
+
+    def basculer_gravite(self):
+        # Désactiver/activer la gravité complètement
+        if self.physique['gravite'] != 0:
+            self.physique['gravite_sauvegarde'] = self.physique['gravite']
+            self.physique['gravite'] = 0
+        else:
+            self.physique['gravite'] = self.physique.get('gravite_sauvegarde', 400)
+
+    def basculer_pause(self):
+        self.en_pause = not self.en_pause
+
+    def allonger_trainee(self):
+        self.balle.ajuster_trainee(self.balle.max_trainee + 10)
+
+    def raccourcir_trainee(self):
+        self.balle.ajuster_trainee(self.balle.max_trainee - 10)
+
+    def effacer_trainee(self):
+        self.balle.trainee.clear()
+
+    def appliquer_commande(self, commande):
+        """Applique une commande de COMMANDES (touche du jeu ou rejeu)"""
+        if commande not in COMMANDES:
+            raise ValueError(f"Commande inconnue : {commande}")
+        getattr(self, commande)()
+
+    def avancer(self, dt_reel):
+        """Accumule le temps écoulé et exécute autant de pas fixes que nécessaire"""
+        if self.en_pause:
+            return 0
+        self.accumulateur += min(dt_reel, self.dt_max)
+        n = 0
+        while self.accumulateur >= self.dt_fixe:
+            self.pas(self.dt_fixe)
+            self.accumulateur -= self.dt_fixe
+            n += 1
+        return n
+
+    def pas(self, dt):
+        """Un pas de physique de durée dt"""
+        if self.collision_continue:
+            self.pas_continu(dt)
+        else:
+            # Mettre à jour les cercles
+            self.avancer_cercles(dt)
+
+            # Vérifier les collisions et remplacer les cercles disparus
+            self.resoudre_collisions()
+
+            # Déplacer la balle
+            self.deplacer_balle(dt)
+
+        # Mettre à jour les effets
+        self.effets.update(dt)
+        if self.profileur:
+            self.profileur.marquer('effets')
+
+        self.temps += dt
+        self.pas_effectues += 1
+
+    def pas_continu(self, dt):
+        # Les collisions sont résolues avant de prévoir l'impact suivant,
+        # pour que la prévision utilise la vitesse après rebond
+        restant = dt
+        for _ in range(self.sous_pas_max):
+            self.resoudre_collisions()
+            impact = self.temps_impact(restant)
+            if self.profileur:
+                self.profileur.marquer('collisions')
+
+            # Sous-pas uniquement quand un impact est prévu avant la fin du pas
+            duree = restant if impact is None else min(impact, restant)
+            self.avancer_cercles(duree)
+            self.deplacer_balle(duree)
+            restant -= duree
+            if restant <= 0:
+                return
+
+        # Trop d'impacts dans ce pas : finir en discret, en sous-pas assez courts
+        # pour que la balle n'avance pas de plus de son rayon entre deux tests
+        self.pas_continus_epuises += 1
+        balle = self.balle
+        vitesse = math.sqrt(balle.vitesse_x**2 + balle.vitesse_y**2)
+        n = max(1, math.ceil(vitesse * restant / balle.rayon))
+        for _ in range(n):
+            self.avancer_cercles(restant / n)
+            self.resoudre_collisions()
+            self.deplacer_balle(restant / n)
+
+    def temps_impact(self, duree):
+        """Premier impact prévu entre la balle et un cercle pendant duree, ou None"""
+        balle = self.balle
+        distance = math.sqrt((balle.x - self.centre_x)**2 + (balle.y - self.centre_y)**2)
+        vitesse = math.sqrt(balle.vitesse_x**2 + balle.vitesse_y**2)
+        # Seuls les cercles atteignables pendant duree peuvent être touchés
+        portee = vitesse * duree + balle.rayon + 2
+        premier = None
+        for cercle in self.index.entre(distance - portee,
+                                       distance + portee + self.index.vitesse_reduction_max * duree):
+            t = cercle.temps_impact(balle, duree)
+            if t is not None and (premier is None or t < premier):
+                premier = t
+        return premier
+
+    def avancer_cercles(self, dt):
+        for cercle in self.cercles:
+            cercle.tourner(dt)
+            cercle.reduire_taille(dt)
+        self.index.reordonner()
+        if self.profileur:
+            self.profileur.marquer('cercles')
+
+    def deplacer_balle(self, dt):
+        self.balle.deplacer(dt, self.physique['gravite'], self.rng, self.physique['vitesse_min'])
+        self.rebondir_murs()
+        if self.profileur:
+            self.profileur.marquer('deplacer')
+
+    def cercles_proches(self):
+        """Cercles à tester pour la position actuelle de la balle, dans l'ordre de la liste"""
+        balle = self.balle
+        # Seuls les cercles dont le rayon encadre la distance de la balle peuvent être touchés
+        distance = math.sqrt((balle.x - self.centre_x)**2 + (balle.y - self.centre_y)**2)
+        marge = balle.rayon + 2
+        candidats = self.index.entre(distance - marge, distance + marge)
+        for cercle in self.cercles_suivis:
+            if cercle.actif and cercle not in candidats:
+                candidats.append(cercle)
+        positions = self.positions
+        candidats.sort(key=lambda cercle: positions[id(cercle)])
+        return candidats
+
+    def resoudre_collisions(self):
+        balle = self.balle
+        cercles = self.cercles
+        positions = self.positions
+
+        candidats = self.cercles_proches()
+        disparus = []
+        k = 0
+        while k < len(candidats):
+            cercle = candidats[k]
+            k += 1
+            if cercle.verifier_collision(balle):
+                cercle.faire_rebondir(balle)
+                # La balle a été replacée : ajouter les cercles suivants devenus proches
+                position = positions[id(cercle)]
+                restants = candidats[k:]
+                for proche in self.cercles_proches():
+                    if positions[id(proche)] > position and proche not in restants:
+                        restants.append(proche)
+                restants.sort(key=lambda c: positions[id(c)])
+                candidats[k:] = restants
+
+            # Si le cercle vient de disparaître
+            if cercle.vient_de_disparaitre:
+                cercle.vient_de_disparaitre = False
+                self.effets.emettre(cercle.x, cercle.y, cercle.rayon, cercle.couleur)
+                disparus.append(cercle)
+                self.compter_echappement()
+
+        self.cercles_suivis = [c for c in candidats if c.actif and c.dans_ouverture]
+
+        # Remplacer les cercles disparus par de nouveaux
+        for cercle in disparus:
+            self.index.retirer(cercle)
+            nouveau = self.nouveau_cercle_exterieur(self.index)
+            i = self.positions.pop(id(cercle))
+            cercles[i] = nouveau
+            self.positions[id(nouveau)] = i
+            self.index.ajouter(nouveau)
+
+        if self.profileur:
+            self.profileur.marquer('collisions')
+
+    def compter_echappement(self):
+        self.cercles_echappes += 1
+        if self.temps_premier_echappement is None:
+            self.temps_premier_echappement = self.temps
+
+    def rebondir_murs(self):
+        rebondir_sur_bords(self.balle, 0, 0, self.largeur, self.hauteur)
+
+    def energie(self):
+        vitesse_totale = math.sqrt(self.balle.vitesse_x**2 + self.balle.vitesse_y**2)
+        return vitesse_totale**2 / 100 + abs(self.physique['gravite']) * (self.hauteur - self.balle.y) / 1000
+
+    def instantane(self):
+        """Copie immuable de l'état courant, à destination du rendu"""
+        return Instantane(
+            self.temps,
+            self.balle.etat(),
+            tuple(cercle.etat() for cercle in self.cercles),
+            tuple(effet.etat() for effet in self.effets),
+        )
@@ -0,0 +1,73 @@
+import csv
+import json
+import time
+from collections import deque
+
+
+def centile(valeurs_triees, p):
+    """Centile p (0-100) par rang le plus proche d'une liste déjà triée"""
+    if not valeurs_triees:
+        return 0.0
+    rang = max(0, min(len(valeurs_triees) - 1, round(p / 100 * len(valeurs_triees)) - 1))
+    return valeurs_triees[rang]
+
+
+# Chronométrage des phases de chaque image
+class Profileur:
+    """Temps passé par phase et par image, avec centiles glissants et trace exportable
+
+    marquer(phase) attribue à phase le temps écoulé depuis la marque précédente ;
+    nouvelle_image() clôt l'image en cours.
+    """
+
+    def __init__(self, fenetre=600, trace=False):
+        self.fenetre = fenetre  # Nombre d'images conservées pour les centiles
+        self.historique = {}
+        self.image = {}
+        self.trace = [] if trace else None
+        self.n_images = 0
+        self.derniere_marque = time.perf_counter()
+
+    def marquer(self, phase):
+        maintenant = time.perf_counter()
+        self.image[phase] = self.image.get(phase, 0.0) + maintenant - self.derniere_marque
+        self.derniere_marque = maintenant
+
+    def nouvelle_image(self):
+        for phase, duree in self.image.items():
+            if phase not in self.historique:
+                self.historique[phase] = deque(maxlen=self.fenetre)
+            self.historique[phase].append(duree)
+        if self.trace is not None:
+            self.trace.append((self.n_images, self.image))
+        self.image = {}
+        self.n_images += 1
+        self.derniere_marque = time.perf_counter()
+
+    def statistiques(self):
+        """{phase: (p50, p95, p99)} en millisecondes sur la fenêtre glissante"""
+        stats = {}
+        for phase, durees in self.historique.items():
+            triees = sorted(durees)
+            stats[phase] = tuple(centile(triees, p) * 1000 for p in (50, 95, 99))
+        return stats
+
+    def exporter(self, chemin):
+        """Écrit la trace image par image (.csv) ou trace et centiles (.json)"""
+        if self.trace is None:
+            raise ValueError("Profileur créé sans trace (trace=True)")
+        phases = list(self.historique)
+        if chemin.endswith('.json'):
+            with open(chemin, 'w', encoding='utf-8') as fichier:
+                json.dump({
+                    'centiles_ms': {phase: dict(zip(('p50', 'p95', 'p99'), valeurs))
+                                    for phase, valeurs in self.statistiques().items()},
+                    'images': [{'image': n, **{phase: duree * 1000 for phase, duree in image.items()}}
+                               for n, image in self.trace],
+                }, fichier, indent=1)
+        else:
+            with open(chemin, 'w', newline='', encoding='utf-8') as fichier:
+                ecrivain = csv.writer(fichier)
+                ecrivain.writerow(['image'] + [f'{phase}_ms' for phase in phases])
+                for n, image in self.trace:
+                    ecrivain.writerow([n] + [f'{image.get(phase, 0.0) * 1000:.4f}' for phase in phases])
@@ -0,0 +1,303 @@
+import math
+from collections import OrderedDict
+
+import pygame
+
+from moteur import BLANC, JAUNE, NOIR, ROUGE, VERT
+
+
+# Sprites de traînée pré-rendus
+class CacheSprites:
+    """Disques semi-transparents déjà dessinés, par (taille, alpha, couleur)"""
+
+    def __init__(self, taille_max=512):
+        self.taille_max = taille_max
+        self.sprites = OrderedDict()
+
+    def sprite(self, taille, alpha, couleur):
+        cle = (taille, alpha, couleur)
+        sprite = self.sprites.get(cle)
+        if sprite is None:
+            sprite = pygame.Surface((taille * 2, taille * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (*couleur, alpha), (taille, taille), taille)
+            self.sprites[cle] = sprite
+            if len(self.sprites) > self.taille_max:
+                self.sprites.popitem(last=False)
+        else:
+            self.sprites.move_to_end(cle)
+        return sprite
+
+
+cache_sprites = CacheSprites()
+
+
+# Dessin de la balle et de sa traînée
+def dessiner_balle(surface, balle):
+    trainee = balle.trainee
+    n = len(trainee)
+
+    # Dessiner la traînée en un seul appel à blits
+    if n > 1:
+        a_dessiner = []
+        for i, (x, y) in enumerate(trainee):
+            # Calculer l'opacité et la taille en fonction de la position dans la traînée
+            alpha = int(255 * (i / n) * 0.5)  # 50% d'opacité max
+            taille = int(balle.rayon * (i / n))
+
+            if taille > 0 and alpha > 0:
+                sprite = cache_sprites.sprite(taille, alpha, balle.couleur)
+                a_dessiner.append((sprite, (int(x - taille), int(y - taille))))
+        rects = surface.blits(a_dessiner)
+    else:
+        rects = []
+
+    # Dessiner la balle principale
+    rect = pygame.draw.circle(surface, balle.couleur, (int(balle.x), int(balle.y)), balle.rayon)
+
+    # Dessiner un petit effet lumineux au centre
+    pygame.draw.circle(surface, (255, 255, 255), (int(balle.x - 2), int(balle.y - 2)), 2)
+
+    # Zone modifiée : balle et traînée
+    return rect.unionall(rects)
+
+
+# Géométrie des arcs précalculée
+class CacheArcs:
+    """Tables du cercle unité et contours déjà mis à l'échelle, par rayon arrondi"""
+
+    def __init__(self, segments=100, taille_max=1024):
+        self.segments = segments
+        self.pas_angle = 360 / segments
+        self.taille_max = taille_max
+        # Cosinus et sinus des segments, calculés une seule fois
+        self.cos = [math.cos(math.radians(i * self.pas_angle)) for i in range(segments)]
+        self.sin = [math.sin(math.radians(i * self.pas_angle)) for i in range(segments)]
+        self.contours = OrderedDict()
+
+    def contour(self, x, y, rayon):
+        """Points du cercle complet, répétés deux fois pour découper sans modulo"""
+        cle = (x, y, int(round(rayon)))
+        points = self.contours.get(cle)
+        if points is None:
+            r = cle[2]
+            points = [(x + r * c, y + r * s) for c, s in zip(self.cos, self.sin)]
+            points += points
+            self.contours[cle] = points
+            if len(self.contours) > self.taille_max:
+                self.contours.popitem(last=False)
+        else:
+            self.contours.move_to_end(cle)
+        return points
+
+    def arc_visible(self, x, y, rayon, angle_debut, angle_ouverture):
+        """Points de l'arc plein (hors ouverture) et indique s'il est fermé"""
+        points = self.contour(x, y, rayon)
+        # Indices des sommets qui tombent dans l'ouverture [debut, debut + ouverture]
+        premier = math.ceil(angle_debut / self.pas_angle)
+        dernier = math.floor((angle_debut + angle_ouverture) / self.pas_angle)
+        dans_ouverture = dernier - premier + 1
+        if dans_ouverture <= 0:
+            return points[:self.segments], True
+        # L'arc plein commence juste après l'ouverture : simple décalage d'indice
+        depart = (dernier + 1) % self.segments
+        return points[depart:depart + self.segments - dans_ouverture], False
+
+
+cache_arcs = CacheArcs()
+
+
+# Dessin d'un cercle avec son ouverture
+def dessiner_cercle(surface, cercle):
+    """Dessine un cercle et renvoie la zone modifiée (ou None)"""
+    if not cercle.actif:
+        return None
+
+    largeur, hauteur = surface.get_size()
+
+    # Ne dessiner que si le cercle est au moins partiellement visible
+    distance_centre_ecran = math.sqrt((cercle.x - largeur/2)**2 + (cercle.y - hauteur/2)**2)
+    diagonal_ecran = math.sqrt(largeur**2 + hauteur**2) / 2
+
+    if distance_centre_ecran - cercle.rayon > diagonal_ecran:
+        return None  # Le cercle est complètement hors écran
+
+    # Calculer les angles de l'ouverture
+    angle_debut = (cercle.angle - cercle.angle_ouverture / 2) % 360
+    angle_fin = (cercle.angle + cercle.angle_ouverture / 2) % 360
+
+    # Un seul tracé pour tout l'arc plein (pygame découpe ce qui sort de l'écran)
+    points, ferme = cache_arcs.arc_visible(cercle.x, cercle.y, cercle.rayon,
+                                           angle_debut, cercle.angle_ouverture)
+    rects = []
+    if len(points) > 1:
+        rects.append(pygame.draw.lines(surface, cercle.couleur, ferme, points, cercle.epaisseur))
+
+    # Indicateurs visuels aux extrémités de l'ouverture
+    x_debut = cercle.x + cercle.rayon * math.cos(math.radians(angle_debut))
+    y_debut = cercle.y + cercle.rayon * math.sin(math.radians(angle_debut))
+    x_fin = cercle.x + cercle.rayon * math.cos(math.radians(angle_fin))
+    y_fin = cercle.y + cercle.rayon * math.sin(math.radians(angle_fin))
+
+    # Petits cercles aux extrémités (seulement s'ils sont visibles)
+    if -50 < x_debut < largeur + 50 and -50 < y_debut < hauteur + 50:
+        rects.append(pygame.draw.circle(surface, cercle.couleur, (int(x_debut), int(y_debut)), 6))
+    if -50 < x_fin < largeur + 50 and -50 < y_fin < hauteur + 50:
+        rects.append(pygame.draw.circle(surface, cercle.couleur, (int(x_fin), int(y_fin)), 6))
+    return rects[0].unionall(rects[1:]) if rects else None
+
+
+# Dessin des effets de disparition
+class CoucheEffets:
+    """Surface transparente partagée : tous les effets y sont tracés, puis composés en un blit par zone"""
+
+    def __init__(self):
+        self.couche = None
+
+    def dessiner(self, surface, effets):
+        """Dessine les effets et renvoie les zones modifiées"""
+        rects = []
+        for effet in effets:
+            if effet.alpha > 0:
+                if self.couche is None or self.couche.get_size() != surface.get_size():
+                    self.couche = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+                couleur_alpha = (*effet.couleur, int(effet.alpha))
+                rects.append(pygame.draw.circle(self.couche, couleur_alpha, (int(effet.x), int(effet.y)),
+                                                int(effet.rayon + effet.expansion), 3))
+        zones = fusionner(rects)
+        for zone in zones:
+            surface.blit(self.couche, zone, zone)
+            # Ne vider que ce qui a été dessiné
+            self.couche.fill((0, 0, 0, 0), zone)
+        return zones
+
+
+couche_effets = CoucheEffets()
+
+
+def dessiner_effets(surface, effets):
+    return couche_effets.dessiner(surface, effets)
+
+
+def dessiner_scene(surface, instantane):
+    """Dessine un instantané complet de la simulation et renvoie les zones modifiées"""
+    rects = [dessiner_cercle(surface, cercle) for cercle in instantane.cercles]
+    rects += dessiner_effets(surface, instantane.effets)
+    rects.append(dessiner_balle(surface, instantane.balle))
+    rects += [dessiner_balle(surface, balle) for balle in instantane.balles]
+    return [rect for rect in rects if rect]
+
+
+def fusionner(rects):
+    """Fusionne les rectangles qui se chevauchent (les cercles concentriques n'en font plus qu'un)"""
+    fusionnes = []
+    for rect in sorted(rects, key=lambda r: r.w * r.h, reverse=True):
+        rect = pygame.Rect(rect)
+        i = rect.collidelist(fusionnes)
+        while i != -1:
+            rect.union_ip(fusionnes.pop(i))
+            i = rect.collidelist(fusionnes)
+        fusionnes.append(rect)
+    return fusionnes
+
+
+# Rendu par zones modifiées
+class ZonesModifiees:
+    """N'efface et ne présente que les zones dessinées à l'image précédente et à l'image courante"""
+
+    def __init__(self, fond=NOIR):
+        self.fond = fond
+        self.precedentes = []
+
+    def effacer(self, surface):
+        for rect in self.precedentes:
+            surface.fill(self.fond, rect)
+
+    def presenter(self, rects):
+        rects = fusionner([rect for rect in rects if rect])
+        pygame.display.update(self.precedentes + rects)
+        self.precedentes = rects
+
+    def ajouter(self, rects):
+        """Présente des zones dessinées par-dessus l'image courante, sans rien effacer"""
+        nouvelles = [rect for rect in rects if rect and rect not in self.precedentes]
+        pygame.display.update(nouvelles)
+        self.precedentes += nouvelles
+
+
+# Informations affichées à l'écran
+class Hud:
+    """Textes du HUD, rendus une seule fois par (texte, police, couleur) grâce à un cache LRU"""
+
+    instructions = [
+        "ESPACE: Reset | R: Reset balle | P: Pause | G: Inverser gravité | N: On/Off gravité",
+        "↑↓: FPS ±30 | PageUp/Down: FPS ±60 | F3: Profil | ESC: Quitter"
+    ]
+
+    def __init__(self, font, font_small, taille_max=256):
+        self.font = font
+        self.font_small = font_small
+        self.taille_max = taille_max
+        self.textes = OrderedDict()
+
+    def texte(self, font, chaine, couleur):
+        """Surface du texte, rendue seulement si elle n'est pas déjà en cache"""
+        cle = (chaine, id(font), couleur)
+        surface = self.textes.get(cle)
+        if surface is None:
+            surface = font.render(chaine, True, couleur)
+            self.textes[cle] = surface
+            if len(self.textes) > self.taille_max:
+                self.textes.popitem(last=False)
+        else:
+            self.textes.move_to_end(cle)
+        return surface
+
+    def dessiner_lignes(self, surface, font, lignes, x, y, interligne, couleur=BLANC):
+        return surface.blits([(self.texte(font, ligne, couleur), (x, y + i * interligne))
+                              for i, ligne in enumerate(lignes)])
+
+    def dessiner(self, surface, etat, physique, fps_actuel, energie, max_trainee):
+        """Dessine le HUD d'un instantané et renvoie les rectangles modifiés"""
+        font, font_small = self.font, self.font_small
+        cercles = etat.cercles
+        a_dessiner = []
+
+        # Nombre de cercles visibles et total
+        cercles_visibles = sum(1 for c in cercles if c.actif and c.rayon < 350)
+        cercles_hors_ecran = sum(1 for c in cercles if c.actif and c.rayon > 350)
+        a_dessiner.append((self.texte(font, f"Cercles: {cercles_visibles} visibles / {len(cercles)} total", BLANC), (10, 10)))
+
+        # Gravité et FPS
+        if physique['gravite'] == 0:
+            texte_gravite = "Gravité: OFF"
+        else:
+            texte_gravite = f"Gravité: {'↓' if physique['gravite'] > 0 else '↑'}"
+        a_dessiner.append((self.texte(font, texte_gravite, BLANC), (10, 40)))
+
+        # FPS avec indicateur
+        couleur_fps = VERT if fps_actuel >= physique['fps_cible'] - 5 else JAUNE if fps_actuel >= physique['fps_cible'] - 15 else ROUGE
+        a_dessiner.append((self.texte(font, f"FPS: {physique['fps_cible']} (réel: {fps_actuel})", couleur_fps), (250, 10)))
+
+        # Instructions et info
+        for i, instruction in enumerate(self.instructions):
+            a_dessiner.append((self.texte(font_small, instruction, BLANC), (10, 75 + i * 22)))
+
+        # Info sur les cercles hors écran
+        if cercles_hors_ecran > 0:
+            a_dessiner.append((self.texte(font_small, f"({cercles_hors_ecran} cercles apparaissent progressivement)", (150, 150, 150)), (10, 145)))
+
+        # Vitesse et énergie
+        balle = etat.balle
+        vitesse_totale = math.sqrt(balle.vitesse_x**2 + balle.vitesse_y**2)
+
+        y_texte = 165 if cercles_hors_ecran > 0 else 145
+        a_dessiner.append((self.texte(font_small, f"Vitesse: {vitesse_totale:.0f} px/s", BLANC), (10, y_texte)))
+        a_dessiner.append((self.texte(font_small, f"Énergie: {energie:.0f}", BLANC), (10, y_texte + 22)))
+        a_dessiner.append((self.texte(font_small, f"Traînée: {max_trainee} (T/Y: ajuster, C: effacer)", BLANC), (10, y_texte + 44)))
+
+        return surface.blits(a_dessiner)
+
+    def dessiner_pause(self, surface):
+        texte_pause = self.texte(self.font, "PAUSE", BLANC)
+        rect_pause = texte_pause.get_rect(center=(surface.get_width() // 2, surface.get_height() // 2))
+        return surface.blit(texte_pause, rect_pause)
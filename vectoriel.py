@@ -0,0 +1,245 @@
+import random
+
+import numpy as np
+
+from moteur import (
+    LARGEUR, HAUTEUR, Cercle, EtatBalle, EtatCercle, Instantane, Simulation,
+    couleurs, BLANC,
+)
+
+
+# Population de balles en tableaux (une case par balle)
+class PopulationBalles:
+    def __init__(self, n, rayon=8):
+        self.n = n
+        self.x = np.zeros(n)
+        self.y = np.zeros(n)
+        self.vitesse_x = np.zeros(n)
+        self.vitesse_y = np.zeros(n)
+        self.rayon = np.full(n, float(rayon))
+
+    def __len__(self):
+        return self.n
+
+    def vitesses(self):
+        return np.hypot(self.vitesse_x, self.vitesse_y)
+
+
+# Même physique que Simulation, évaluée pour toutes les balles à la fois
+class SimulationVectorielle(Simulation):
+    """Simulation de milliers de balles indépendantes dans les mêmes cercles
+
+    Les balles n'ont pas de traînée, et seules les collisions discrètes existent :
+    collision_continue est refusée.
+    """
+
+    def __init__(self, n_balles, largeur=LARGEUR, hauteur=HAUTEUR, dt_fixe=None,
+                 parametres=None, collision_continue=False, graine=None):
+        if collision_continue:
+            raise ValueError("SimulationVectorielle ne gère pas la collision continue")
+        if graine is None:
+            graine = random.randrange(2**63)
+        self.n_balles = n_balles
+        self.generateur = np.random.default_rng(graine)
+        self.balles = PopulationBalles(n_balles)
+        super().__init__(largeur, hauteur, dt_fixe, parametres, graine=graine)
+
+    def reinitialiser_balle(self):
+        # Toutes les balles au centre exact avec une vitesse aléatoire
+        balles = self.balles
+        balles.x[:] = self.centre_x
+        balles.y[:] = self.centre_y
+        balles.vitesse_x[:] = self.generateur.uniform(-300, 300, self.n_balles)
+        balles.vitesse_y[:] = self.generateur.uniform(-120, 120, self.n_balles)
+
+    def reinitialiser_cercles(self):
+        rayons = self.physique['rayons']
+        n = len(rayons)
+        self.rayons_cercles = np.zeros(n)
+        self.angles = np.zeros(n)
+        self.vitesses_rotation = np.zeros(n)
+        self.angles_ouverture = np.zeros(n)
+        self.vitesses_reduction = np.zeros(n)
+        self.rayons_min = np.zeros(n)
+        self.epaisseurs = np.zeros(n, dtype=int)
+        self.couleurs_cercles = [None] * n
+        # Suivi de l'ouverture par couple (balle, cercle)
+        self.dans_ouverture = np.zeros((self.n_balles, n), dtype=bool)
+        vitesse_rotation = self.physique['vitesse_commune']
+        for i, rayon in enumerate(rayons):
+            couleur = couleurs[i % len(couleurs)]
+            # Alternance du sens de rotation
+            vitesse = vitesse_rotation if i % 2 == 0 else -vitesse_rotation
+            self.charger_cercle(i, self.configurer_cercle(
+                Cercle(self.centre_x, self.centre_y, rayon, couleur, vitesse, self.rng)))
+        self.effets.clear()
+
+    def charger_cercle(self, i, cercle):
+        self.rayons_cercles[i] = cercle.rayon
+        self.angles[i] = cercle.angle
+        self.vitesses_rotation[i] = cercle.vitesse_rotation
+        self.angles_ouverture[i] = cercle.angle_ouverture
+        self.vitesses_reduction[i] = cercle.vitesse_reduction
+        self.rayons_min[i] = cercle.rayon_min
+        self.epaisseurs[i] = cercle.epaisseur
+        self.couleurs_cercles[i] = cercle.couleur
+        self.dans_ouverture[:, i] = False
+
+    def etats_cercles(self):
+        return [
+            EtatCercle(self.centre_x, self.centre_y, float(self.rayons_cercles[i]),
+                       self.couleurs_cercles[i], float(self.angles[i]),
+                       float(self.angles_ouverture[i]), int(self.epaisseurs[i]), True)
+            for i in range(len(self.rayons_cercles))
+        ]
+
+    def pas(self, dt):
+        """Un pas de physique de durée dt pour toute la population"""
+        balles = self.balles
+
+        # Mettre à jour les cercles
+        self.angles = (self.angles + self.vitesses_rotation * dt) % 360
+        reduit = self.rayons_cercles > self.rayons_min
+        self.rayons_cercles = np.where(
+            reduit,
+            np.maximum(self.rayons_cercles - self.vitesses_reduction * dt, self.rayons_min),
+            self.rayons_cercles)
+
+        # Distance et angle de chaque balle par rapport au centre commun
+        dx = balles.x - self.centre_x
+        dy = balles.y - self.centre_y
+        distance = np.hypot(dx, dy)
+        angle_balle = np.degrees(np.arctan2(dy, dx)) % 360
+
+        # Cercles testés dans l'ordre de la liste, comme Simulation.resoudre_collisions :
+        # chacun voit les balles déjà replacées par les rebonds sur les précédents
+        traverses = np.zeros(len(self.rayons_cercles), dtype=bool)
+        for i in range(len(self.rayons_cercles)):
+            traverses[i] = self.resoudre_cercle(i, dx, dy, distance, angle_balle)
+
+        # Remplacer les cercles traversés par de nouveaux
+        for i in np.nonzero(traverses)[0]:
+            self.compter_echappement()
+            etats = self.etats_cercles()
+            etats[i] = etats[i]._replace(actif=False)
+            self.charger_cercle(i, self.nouveau_cercle_exterieur(etats))
+
+        # Déplacer les balles
+        balles.vitesse_y += self.physique['gravite'] * dt
+        balles.x += balles.vitesse_x * dt
+        balles.y += balles.vitesse_y * dt
+        self.appliquer_vitesse_min()
+        self.rebondir_murs()
+
+        self.temps += dt
+        self.pas_effectues += 1
+
+    def resoudre_cercle(self, i, dx, dy, distance, angle_balle):
+        """Contacts de toutes les balles avec le cercle i ; vrai si une balle l'a traversé
+
+        dx, dy, distance et angle_balle sont mis à jour pour les balles replacées.
+        """
+        balles = self.balles
+        rayon_cercle = self.rayons_cercles[i]
+        touche = np.abs(distance - rayon_cercle) <= balles.rayon + 2
+
+        angle_debut = (self.angles[i] - self.angles_ouverture[i] / 2) % 360
+        angle_fin = (self.angles[i] + self.angles_ouverture[i] / 2) % 360
+        if angle_debut <= angle_fin:
+            dans_ouverture = (angle_balle >= angle_debut) & (angle_balle <= angle_fin)
+        else:
+            dans_ouverture = (angle_balle >= angle_debut) | (angle_balle <= angle_fin)
+
+        # Traversée : la balle était dans l'ouverture et touche la partie pleine ou s'éloigne
+        etait_dans_ouverture = self.dans_ouverture[:, i]
+        traverse = etait_dans_ouverture & ~(touche & dans_ouverture)
+        collision = touche & ~dans_ouverture & ~etait_dans_ouverture & (distance != 0)
+        self.dans_ouverture[:, i] = touche & dans_ouverture
+
+        indices = np.nonzero(collision)[0]
+        if len(indices):
+            d = distance[indices]
+            nx = dx[indices] / d
+            ny = dy[indices] / d
+            dot = balles.vitesse_x[indices] * nx + balles.vitesse_y[indices] * ny
+            interieur = d < rayon_cercle
+
+            # Rebond uniquement si nécessaire
+            rebond = (interieur & (dot > 0)) | ((d > rayon_cercle) & (dot < 0))
+            indices, nx, ny, dot, interieur = (
+                indices[rebond], nx[rebond], ny[rebond], dot[rebond], interieur[rebond])
+            balles.vitesse_x[indices] -= 2 * dot * nx
+            balles.vitesse_y[indices] -= 2 * dot * ny
+
+            # Replacer la balle pour éviter qu'elle reste coincée
+            r = balles.rayon[indices]
+            rayon_replace = np.where(interieur, rayon_cercle - r - 1, rayon_cercle + r + 1)
+            dx[indices] = nx * rayon_replace
+            dy[indices] = ny * rayon_replace
+            distance[indices] = np.abs(rayon_replace)
+            # Cercle plus petit que la balle : replacée de l'autre côté du centre
+            angle_balle[indices[rayon_replace < 0]] += 180
+            angle_balle %= 360
+            balles.x[indices] = self.centre_x + dx[indices]
+            balles.y[indices] = self.centre_y + dy[indices]
+        return bool(traverse.any())
+
+    def appliquer_vitesse_min(self):
+        # Vitesse minimale pour éviter que les balles s'arrêtent
+        balles = self.balles
+        vitesse_min = self.physique['vitesse_min']
+        vitesse_totale = balles.vitesses()
+        lentes = np.nonzero(vitesse_totale < vitesse_min)[0]
+        if len(lentes) == 0:
+            return
+        v = vitesse_totale[lentes]
+        arretees = v == 0
+        angle = self.generateur.uniform(0, 2 * np.pi, len(lentes))
+        v_sure = np.where(arretees, 1.0, v)
+        balles.vitesse_x[lentes] = np.where(arretees, vitesse_min * np.cos(angle),
+                                            balles.vitesse_x[lentes] / v_sure * vitesse_min)
+        balles.vitesse_y[lentes] = np.where(arretees, vitesse_min * np.sin(angle),
+                                            balles.vitesse_y[lentes] / v_sure * vitesse_min)
+
+        # Ajouter une petite variation pour éviter les boucles
+        balles.vitesse_x[lentes] += self.generateur.uniform(-30, 30, len(lentes))
+        balles.vitesse_y[lentes] += self.generateur.uniform(-30, 30, len(lentes))
+
+    def rebondir_murs(self):
+        # Rebonds sur les bords (conservation parfaite de l'énergie)
+        balles = self.balles
+        r = balles.rayon
+        bord_x = (balles.x - r <= 0) | (balles.x + r >= self.largeur)
+        balles.vitesse_x[bord_x] *= -1
+        balles.x = np.clip(balles.x, r, self.largeur - r)
+
+        bas = balles.y + r >= self.hauteur
+        bord_y = (balles.y - r <= 0) | bas
+        balles.vitesse_y[bord_y] *= -1
+
+        # Boost supplémentaire au rebond du bas pour compenser la gravité
+        balles.vitesse_y[bas & (np.abs(balles.vitesse_y) < 300)] = -300
+        balles.y = np.clip(balles.y, r, self.hauteur - r)
+
+    # Pas de traînée pour la population : les commandes de traînée sont sans effet
+    def allonger_trainee(self):
+        pass
+
+    def raccourcir_trainee(self):
+        pass
+
+    def effacer_trainee(self):
+        pass
+
+    def energie(self):
+        """Énergie moyenne de la population"""
+        balles = self.balles
+        energies = balles.vitesses()**2 / 100 + abs(self.physique['gravite']) * (self.hauteur - balles.y) / 1000
+        return float(energies.mean())
+
+    def instantane(self):
+        """Instantané des cercles, avec la balle d'indice 0 comme balle de référence"""
+        balles = self.balles
+        balle = EtatBalle(float(balles.x[0]), float(balles.y[0]), int(balles.rayon[0]), BLANC,
+                          float(balles.vitesse_x[0]), float(balles.vitesse_y[0]), ())
+        return Instantane(self.temps, balle, tuple(self.etats_cercles()), ())
@@ -0,0 +1,87 @@
+"""Vérifications de non-régression de la physique, sans fenêtre ni dépendance.
+
+    python verifications.py
+
+Chaque vérification affiche OK ou ÉCHEC ; le code de sortie vaut 1 si l'une échoue.
+"""
+import math
+import sys
+
+from evenements import SimulationEvenements
+from moteur import Simulation
+
+# Cercles fermés (ouverture négligeable) : la balle ne doit jamais sortir du premier
+CERCLES_FERMES = {'gravite': 0, 'angle_ouverture': 0.001, 'rayons': [30, 55, 80]}
+
+
+def balle_lancee(vitesse, graine, parametres, dt=1 / 30):
+    """Simulation continue à dt, balle au centre lancée à vitesse dans une direction tirée de la graine"""
+    simulation = Simulation(dt_fixe=dt, collision_continue=True, parametres=parametres, graine=graine)
+    angle = simulation.rng.uniform(0, 2 * math.pi)
+    simulation.balle.vitesse_x = vitesse * math.cos(angle)
+    simulation.balle.vitesse_y = vitesse * math.sin(angle)
+    return simulation
+
+
+def sorties_cercle_ferme(vitesse, graines=20, pas=60):
+    """Nombre de graines où la balle finit hors du plus petit cercle fermé (tunnel)"""
+    sorties = 0
+    for graine in range(graines):
+        simulation = balle_lancee(vitesse, graine, CERCLES_FERMES)
+        for _ in range(pas):
+            simulation.pas(simulation.dt_fixe)
+        balle = simulation.balle
+        distance = math.sqrt((balle.x - simulation.centre_x)**2 + (balle.y - simulation.centre_y)**2)
+        if distance > min(cercle.rayon for cercle in simulation.cercles):
+            sorties += 1
+    return sorties
+
+
+def verifier_pas_de_tunnel():
+    # 2000 px/s à 30 Hz : la corde du cercle intérieur est plus courte qu'un pas ;
+    # 40000 px/s épuise les sous-pas prévus et passe par les sous-pas discrets
+    return all(sorties_cercle_ferme(vitesse) == 0 for vitesse in (2000, 3000, 8000, 40000))
+
+
+def ecart_pas_sautes(graine, parametres, pas=2400):
+    """(échappements à pas fixes, avec pas sautés, plus grand écart de position en px)"""
+    simulation = Simulation(parametres=dict(parametres), graine=graine)
+    sautee = SimulationEvenements(parametres=dict(parametres), graine=graine)
+    ecart = 0.0
+    for i in range(pas):
+        simulation.pas(simulation.dt_fixe)
+        sautee.avancer_jusqua((i + 1) * sautee.dt_fixe)
+        ecart = max(ecart, abs(simulation.balle.x - sautee.balle.x), abs(simulation.balle.y - sautee.balle.y))
+    return simulation.cercles_echappes, sautee.cercles_echappes, ecart
+
+
+def verifier_pas_sautes():
+    # 20 s de partie : les arrondis des sauts restent bien en dessous du pixel
+    for vitesse_reduction in (0, 10, 20):
+        for graine in range(3):
+            attendus, obtenus, ecart = ecart_pas_sautes(graine, {'vitesse_reduction': vitesse_reduction})
+            if attendus != obtenus or ecart > 1e-3:
+                return False
+    return True
+
+
+VERIFICATIONS = {
+    'collision_continue_sans_tunnel': verifier_pas_de_tunnel,
+    'pas_sautes_comme_pas_fixes': verifier_pas_sautes,
+}
+
+
+def main(noms=None):
+    echecs = []
+    for nom, verification in VERIFICATIONS.items():
+        if noms and nom not in noms:
+            continue
+        reussie = verification()
+        print(f"{nom:<40} {'OK' if reussie else 'ÉCHEC'}")
+        if not reussie:
+            echecs.append(nom)
+    return 1 if echecs else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))